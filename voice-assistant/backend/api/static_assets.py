@@ -0,0 +1,63 @@
+import hashlib
+import logging
+import mimetypes
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+from fastapi.responses import FileResponse, Response
+
+class StaticAssets:
+    """Serves the frontend's static files from an index built once at startup
+    
+    Small files are kept in memory; larger ones are sent with FileResponse
+    (sendfile) using the stat taken at startup, so requests never hit the disk
+    for metadata.
+    """
+    
+    def __init__(self, root: Path, max_inline_size: int = 64 * 1024, max_age: int = 3600):
+        self.root = root
+        self.max_inline_size = max_inline_size
+        self.cache_control = f"public, max-age={max_age}"
+        self.logger = logging.getLogger(__name__)
+        # URL path -> (content or path, content type, etag, stat for large files)
+        self._assets: Dict[str, Tuple[Union[bytes, Path], str, str, Optional[os.stat_result]]] = {}
+    
+    def load(self, *directories: str):
+        """Index the files under the given frontend subdirectories"""
+        for directory in directories:
+            base = self.root / directory
+            if not base.is_dir():
+                continue
+            for path in base.rglob("*"):
+                if path.is_file():
+                    self.add(path)
+        
+        self.logger.info(f"Indexed {len(self._assets)} static assets")
+    
+    def add(self, path: Path):
+        """Index a single file"""
+        stat_result = path.stat()
+        url_path = path.relative_to(self.root).as_posix()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        etag = '"' + hashlib.md5(f"{stat_result.st_mtime}-{stat_result.st_size}".encode()).hexdigest() + '"'
+        
+        if stat_result.st_size <= self.max_inline_size:
+            self._assets[url_path] = (path.read_bytes(), content_type, etag, None)
+        else:
+            self._assets[url_path] = (path, content_type, etag, stat_result)
+    
+    def response(self, url_path: str, if_none_match: Optional[str] = None) -> Optional[Response]:
+        """Build the response for an indexed asset, or None if it is unknown"""
+        asset = self._assets.get(url_path)
+        if asset is None:
+            return None
+        
+        payload, content_type, etag, stat_result = asset
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        
+        if if_none_match and etag in if_none_match:
+            return Response(status_code=304, headers=headers)
+        
+        if isinstance(payload, bytes):
+            return Response(content=payload, media_type=content_type, headers=headers)
+        return FileResponse(payload, media_type=content_type, headers=headers, stat_result=stat_result)
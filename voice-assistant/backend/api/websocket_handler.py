@@ -1,22 +1,46 @@
-import json
+import asyncio
 import logging
-from typing import Dict, Any
+import zlib
+from contextlib import suppress
+from typing import Dict, Any, List
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 from ..core.session_manager import session_manager
 
+def _timestamped_template(message: Dict[str, Any]) -> str:
+    """Pre-serialize a constant message, leaving a %s slot for its timestamp"""
+    body = orjson.dumps(message).decode().replace('%', '%%')
+    return body[:-1] + ',"timestamp":"%s"}'
+
+# First byte of binary frames received from the client identifies their payload
+AUDIO_DATA_TAG = b'\x01'  # Recorded WebM/Opus utterance
+
+# First byte of binary frames sent to the client identifies their payload
+AUDIO_CHUNK_TAG = b'\x01'  # Raw PCM chunk of a streamed TTS response
+COMPRESSED_JSON_TAG = b'\x02'  # zlib-compressed JSON message or batch
+
+# Serialized messages at least this large are compressed once before sending;
+# smaller frames (pings, status updates) cost more to deflate than they save
+COMPRESSION_THRESHOLD = 1024
+
+# Inbound messages waiting for the per-connection worker; when full, the
+# receive loop stops reading and the client is back-pressured at the socket
+INBOUND_QUEUE_SIZE = 8
+
+# Hot replies whose content never changes are serialized once at import
+_PONG_TEMPLATE = _timestamped_template({'type': 'pong'})
+_ERROR_ANALYSIS_TEMPLATE = _timestamped_template({
+    'type': 'error_analysis_response',
+    'analysis': 'No recent errors detected in system logs',
+    'root_cause': 'System operating normally',
+    'severity': 'info',
+    'recommendations': ['Continue monitoring'],
+    'predicted_resolution_time': 'immediate'
+})
+
 class WebSocketHandler:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.message_handlers = {
-            'ping': self._handle_ping,
-            'change_provider': self._handle_change_provider,
-            'change_model': self._handle_change_model,
-            'audio_data': self._handle_audio_data,
-            'text_input': self._handle_text_input,
-            'system_status_query': self._handle_system_status_query,
-            'self_awareness_query': self._handle_self_awareness_query,
-            'error_analysis_request': self._handle_error_analysis_request,
-        }
     
     async def handle_connection(self, websocket: WebSocket, session_id: str):
         """Handle WebSocket connection for a session"""
@@ -31,20 +55,36 @@ class WebSocketHandler:
         self.logger.info(f"WebSocket connected for session: {session_id}")
         
         # Send welcome message
-        await websocket.send_json({
+        await self._send_message(websocket, {
             'type': 'connection_established',
             'session_id': session_id,
             'timestamp': session.created_at.isoformat()
         })
         
+        # The receive loop only reads and enqueues; a worker task handles
+        # messages in order, so slow LLM/TTS turns never block receiving
+        inbound: asyncio.Queue = asyncio.Queue(maxsize=INBOUND_QUEUE_SIZE)
+        worker = asyncio.create_task(self._process_inbound(websocket, session, inbound))
+        
         try:
             while True:
-                # Receive message from client
-                data = await websocket.receive_text()
-                message = json.loads(data)
+                # Receive message from client; audio arrives as binary frames
+                frame = await websocket.receive()
+                if frame['type'] == 'websocket.disconnect':
+                    raise WebSocketDisconnect(frame.get('code', 1000))
+                
+                data = frame.get('bytes')
+                if data is not None:
+                    if not await self._enqueue(inbound, data, worker):
+                        break
+                    continue
                 
-                # Route message to appropriate handler
-                await self._route_message(websocket, session, message)
+                message = orjson.loads(frame['text'])
+                if message.get('type') == 'ping':
+                    # Answer keep-alives right away instead of behind queued turns
+                    await self._handle_ping(websocket, session, message)
+                elif not await self._enqueue(inbound, message, worker):
+                    break
                 
         except WebSocketDisconnect:
             self.logger.info(f"WebSocket disconnected for session: {session_id}")
@@ -52,36 +92,174 @@ class WebSocketHandler:
             self.logger.error(f"WebSocket error for session {session_id}: {e}")
             await websocket.close(code=1011, reason="Internal error")
         finally:
+            worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await worker
             session.websocket = None
     
+    async def _enqueue(self, inbound: asyncio.Queue, item: Any, worker: asyncio.Task) -> bool:
+        """Queue an item for the worker; returns False once the worker has stopped"""
+        if worker.done():
+            return False
+        if not inbound.full():
+            inbound.put_nowait(item)
+            return True
+        
+        # Wait for room, but stop waiting if the worker dies and will never make any
+        put = asyncio.ensure_future(inbound.put(item))
+        done, _ = await asyncio.wait({put, worker}, return_when=asyncio.FIRST_COMPLETED)
+        if put in done:
+            return True
+        put.cancel()
+        return False
+    
+    async def _process_inbound(self, websocket: WebSocket, session, inbound: asyncio.Queue):
+        """Route queued client messages one at a time, in arrival order"""
+        try:
+            while True:
+                item = await inbound.get()
+                if isinstance(item, bytes):
+                    await self._route_binary(websocket, session, item)
+                else:
+                    # Route message to appropriate handler
+                    await self._route_message(websocket, session, item)
+        except Exception as e:
+            # The receive loop sees the worker has stopped and exits; the client
+            # is told why the connection is closing
+            self.logger.error(f"WebSocket worker error for session {session.session_id}: {e}")
+            with suppress(Exception):
+                await websocket.close(code=1011, reason="Internal error")
+    
+    async def _send_json(self, websocket: WebSocket, payload: Any):
+        """Send a JSON payload as text, or as a compressed binary frame if large"""
+        data = orjson.dumps(payload)
+        if len(data) >= COMPRESSION_THRESHOLD:
+            await websocket.send_bytes(COMPRESSED_JSON_TAG + zlib.compress(data, 1))
+        else:
+            await websocket.send_text(data.decode())
+    
+    async def _send_message(self, websocket: WebSocket, message: Dict[str, Any]):
+        """Serialize a message with orjson and send it as a single frame"""
+        await self._send_json(websocket, message)
+    
+    async def _send_batch(self, websocket: WebSocket, messages: List[Dict[str, Any]]):
+        """Send several messages as a single JSON-array frame"""
+        if len(messages) == 1:
+            await self._send_json(websocket, messages[0])
+        else:
+            await self._send_json(websocket, messages)
+    
+    async def _stream_speech(self, websocket: WebSocket, session, text: str,
+                             pending: List[Dict[str, Any]] = None, source: str = None) -> bool:
+        """Stream TTS audio for a response as binary PCM frames.
+        
+        Sends an audio_stream_start header (batched with any pending messages),
+        one tagged binary frame per audio chunk, then audio_stream_end. Pending
+        messages are still sent if synthesis fails. Returns True if audio was sent.
+        """
+        from ..audio.speech_processor import speech_processor, TTS_SAMPLE_RATE, TTS_CHANNELS, TTS_FRAME_BYTES
+        
+        outgoing = list(pending or [])
+        chunks = speech_processor.stream_speech(text)
+        
+        try:
+            # Wait for the first chunk so a failed synthesis sends no header
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                chunk = None
+            except Exception as tts_error:
+                self.logger.warning(f"TTS generation failed: {tts_error}")
+                chunk = None
+            
+            if chunk is None:
+                if outgoing:
+                    await self._send_batch(websocket, outgoing)
+                return False
+            
+            stream_start = {
+                'type': 'audio_stream_start',
+                'audio_format': 'pcm_s16le',
+                'sample_rate': TTS_SAMPLE_RATE,
+                'channels': TTS_CHANNELS,
+                'text': text,
+                'timestamp': session.activity_timestamp()
+            }
+            if source:
+                stream_start['source'] = source
+            outgoing.append(stream_start)
+            await self._send_batch(websocket, outgoing)
+            
+            stream_end = {'type': 'audio_stream_end'}
+            byte_count = 0
+            try:
+                while chunk is not None:
+                    await websocket.send_bytes(AUDIO_CHUNK_TAG + chunk)
+                    byte_count += len(chunk)
+                    chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                pass
+            except Exception as tts_error:
+                self.logger.error(f"Error streaming TTS audio: {tts_error}")
+                stream_end['error'] = str(tts_error)
+            
+            stream_end['duration'] = byte_count / (TTS_FRAME_BYTES * TTS_SAMPLE_RATE)
+            stream_end['timestamp'] = session.activity_timestamp()
+            await self._send_message(websocket, stream_end)
+            return 'error' not in stream_end
+        finally:
+            await chunks.aclose()
+    
     async def _route_message(self, websocket: WebSocket, session, message: Dict[str, Any]):
         """Route incoming message to appropriate handler"""
         message_type = message.get('type')
+        handler = _MESSAGE_HANDLERS.get(message_type)
         
-        if message_type in self.message_handlers:
-            try:
-                await self.message_handlers[message_type](websocket, session, message)
-            except Exception as e:
-                self.logger.error(f"Error handling message type {message_type}: {e}")
-                await websocket.send_json({
-                    'type': 'error',
-                    'message': f"Error processing {message_type}",
-                    'timestamp': session.last_activity.isoformat()
-                })
-        else:
+        if handler is None:
             self.logger.warning(f"Unknown message type: {message_type}")
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'error',
                 'message': f"Unknown message type: {message_type}",
-                'timestamp': session.last_activity.isoformat()
+                'timestamp': session.activity_timestamp()
+            })
+            return
+        
+        try:
+            await handler(self, websocket, session, message)
+        except Exception as e:
+            self.logger.error(f"Error handling message type {message_type}: {e}")
+            await self._send_message(websocket, {
+                'type': 'error',
+                'message': f"Error processing {message_type}",
+                'timestamp': session.activity_timestamp()
+            })
+    
+    async def _route_binary(self, websocket: WebSocket, session, data: bytes):
+        """Route an incoming binary frame by its leading tag byte"""
+        tag = data[:1]
+        
+        if tag != AUDIO_DATA_TAG:
+            self.logger.warning(f"Unknown binary frame tag: {tag!r}")
+            await self._send_message(websocket, {
+                'type': 'error',
+                'message': f"Unknown binary frame tag: {tag.hex()}",
+                'timestamp': session.activity_timestamp()
+            })
+            return
+        
+        try:
+            await self._handle_audio_data(websocket, session, data[1:])
+        except Exception as e:
+            self.logger.error(f"Error handling audio data: {e}")
+            await self._send_message(websocket, {
+                'type': 'error',
+                'message': "Error processing audio_data",
+                'timestamp': session.activity_timestamp()
             })
     
     async def _handle_ping(self, websocket: WebSocket, session, message: Dict[str, Any]):
         """Handle ping message"""
-        await websocket.send_json({
-            'type': 'pong',
-            'timestamp': session.last_activity.isoformat()
-        })
+        await websocket.send_text(_PONG_TEMPLATE % session.activity_timestamp())
     
     async def _handle_change_provider(self, websocket: WebSocket, session, message: Dict[str, Any]):
         """Handle provider change request"""
@@ -92,11 +270,11 @@ class WebSocketHandler:
         session.current_provider = provider
         session.current_model = model
         
-        await websocket.send_json({
+        await self._send_message(websocket, {
             'type': 'provider_changed',
             'provider': provider,
             'model': model,
-            'timestamp': session.last_activity.isoformat()
+            'timestamp': session.activity_timestamp()
         })
     
     async def _handle_change_model(self, websocket: WebSocket, session, message: Dict[str, Any]):
@@ -108,104 +286,57 @@ class WebSocketHandler:
         session.current_model = model
         session.current_provider = provider
         
-        await websocket.send_json({
+        await self._send_message(websocket, {
             'type': 'model_changed',
             'provider': provider,
             'model': model,
-            'timestamp': session.last_activity.isoformat()
+            'timestamp': session.activity_timestamp()
         })
     
-    async def _handle_audio_data(self, websocket: WebSocket, session, message: Dict[str, Any]):
+    async def _handle_audio_data(self, websocket: WebSocket, session, audio_bytes: bytes):
         """Handle audio data for transcription"""
         try:
-            audio_data = message.get('data', '')
-            
-            if not audio_data:
-                await websocket.send_json({
+            if not audio_bytes:
+                await self._send_message(websocket, {
                     'type': 'transcription',
                     'text': '',
                     'confidence': 0.0,
                     'error': 'No audio data received',
-                    'timestamp': session.last_activity.isoformat()
+                    'timestamp': session.activity_timestamp()
                 })
                 return
             
             # Import here to avoid circular imports
             from ..audio.speech_processor import speech_processor
-            import base64
-            import tempfile
-            import subprocess
-            from pathlib import Path
-            
-            # Decode base64 audio data
-            audio_bytes = base64.b64decode(audio_data)
-            
-            # Convert WebM to WAV for Whisper (since frontend sends WebM)
-            temp_dir = Path(tempfile.gettempdir()) / "voice_assistant"
-            temp_dir.mkdir(exist_ok=True)
-            
-            # Create temporary files
-            import asyncio
-            task_name = asyncio.current_task().get_name() if asyncio.current_task() else "unknown"
-            temp_webm = temp_dir / f"temp_input_{task_name}.webm"
-            temp_wav = temp_dir / f"temp_converted_{task_name}.wav"
-            
-            # Save WebM data
-            with open(temp_webm, 'wb') as f:
-                f.write(audio_bytes)
-            
-            # Convert WebM to WAV using FFmpeg
-            ffmpeg_command = [
-                'ffmpeg',
-                '-i', str(temp_webm),
-                '-acodec', 'pcm_s16le',
-                '-ar', '16000',  # Whisper prefers 16kHz
-                '-ac', '1',      # Mono
-                '-y',            # Overwrite
-                str(temp_wav)
-            ]
             
-            process = await asyncio.create_subprocess_exec(
-                *ffmpeg_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                self.logger.error(f"FFmpeg conversion failed: {stderr.decode()}")
-                await websocket.send_json({
+            # Decode WebM/Opus to 16 kHz mono PCM in-process (frontend sends WebM)
+            try:
+                pcm = await speech_processor.decode_audio(audio_bytes)
+            except Exception as decode_error:
+                self.logger.error(f"Audio decoding failed: {decode_error}")
+                await self._send_message(websocket, {
                     'type': 'transcription',
                     'text': '',
                     'confidence': 0.0,
                     'error': 'Audio conversion failed',
-                    'timestamp': session.last_activity.isoformat()
+                    'timestamp': session.activity_timestamp()
                 })
                 return
             
-            # Read converted WAV file
-            with open(temp_wav, 'rb') as f:
-                wav_data = f.read()
-            
-            # Clean up temp files
-            temp_webm.unlink(missing_ok=True)
-            temp_wav.unlink(missing_ok=True)
-            
             # Transcribe using Whisper
-            result = await speech_processor.transcribe_audio(wav_data, "wav")
+            result = await speech_processor.transcribe_audio(pcm)
             
             transcribed_text = result.get('text', '').strip()
             
             # Send transcription result
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'transcription',
                 'text': transcribed_text,
                 'confidence': result.get('confidence', 0.0),
                 'language': result.get('language', 'en'),
                 'duration': result.get('duration', 0),
                 'error': result.get('error'),
-                'timestamp': session.last_activity.isoformat()
+                'timestamp': session.activity_timestamp()
             })
             
             # If transcription successful and has text, process with LLM
@@ -229,61 +360,37 @@ class WebSocketHandler:
                         transcribed_text, response_text, used_provider, used_model
                     )
                     
-                    # Send LLM response
-                    await websocket.send_json({
+                    # The response goes out in the same frame as the audio stream header
+                    response_message = {
                         'type': 'response',
                         'text': response_text,
                         'provider': used_provider,
                         'model': used_model,
                         'fallback_used': llm_result.get('fallback_used', False),
                         'source': 'voice_input',
-                        'timestamp': session.last_activity.isoformat()
-                    })
+                        'timestamp': session.activity_timestamp()
+                    }
                     
-                    # Generate and send TTS audio for voice response
-                    try:
-                        import base64
-                        
-                        # Generate TTS audio
-                        tts_result = await speech_processor.synthesize_speech(response_text)
-                        
-                        if tts_result.get('success', False) and tts_result.get('audio_data'):
-                            # Convert audio data to base64 for transmission
-                            audio_base64 = base64.b64encode(tts_result['audio_data']).decode('utf-8')
-                            
-                            await websocket.send_json({
-                                'type': 'audio_response',
-                                'audio_data': audio_base64,
-                                'audio_format': tts_result.get('audio_format', 'wav'),
-                                'duration': tts_result.get('duration', 0),
-                                'text': response_text,
-                                'source': 'voice_input',
-                                'timestamp': session.last_activity.isoformat()
-                            })
-                            
-                            self.logger.info(f"Voice conversation: '{transcribed_text}' -> TTS response generated")
-                        else:
-                            self.logger.warning(f"TTS generation failed for voice response: {tts_result.get('error', 'Unknown error')}")
-                            
-                    except Exception as tts_error:
-                        self.logger.error(f"Error generating TTS for voice response: {tts_error}")
+                    if await self._stream_speech(websocket, session, response_text,
+                                                 [response_message], source='voice_input'):
+                        self.logger.info(f"Voice conversation: '{transcribed_text}' -> TTS response streamed")
                     
                 except Exception as llm_error:
                     self.logger.error(f"Error processing transcribed text with LLM: {llm_error}")
-                    await websocket.send_json({
+                    await self._send_message(websocket, {
                         'type': 'error',
                         'message': f"Error processing voice input: {str(llm_error)}",
-                        'timestamp': session.last_activity.isoformat()
+                        'timestamp': session.activity_timestamp()
                     })
             
         except Exception as e:
             self.logger.error(f"Error processing audio data: {e}")
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'transcription',
                 'text': '',
                 'confidence': 0.0,
                 'error': f'Audio processing error: {str(e)}',
-                'timestamp': session.last_activity.isoformat()
+                'timestamp': session.activity_timestamp()
             })
     
     async def _handle_text_input(self, websocket: WebSocket, session, message: Dict[str, Any]):
@@ -311,100 +418,75 @@ class WebSocketHandler:
             )
             
             # Send text response first
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'response',
                 'text': response_text,
                 'provider': used_provider,
                 'model': used_model,
                 'fallback_used': result.get('fallback_used', False),
-                'timestamp': session.last_activity.isoformat()
+                'timestamp': session.activity_timestamp()
             })
             
-            # Generate and send audio response
-            try:
-                from ..audio.speech_processor import speech_processor
-                import base64
-                
-                # Generate TTS audio
-                tts_result = await speech_processor.synthesize_speech(response_text)
-                
-                if tts_result.get('success', False) and tts_result.get('audio_data'):
-                    # Convert audio data to base64 for transmission
-                    audio_base64 = base64.b64encode(tts_result['audio_data']).decode('utf-8')
-                    
-                    await websocket.send_json({
-                        'type': 'audio_response',
-                        'audio_data': audio_base64,
-                        'audio_format': tts_result.get('audio_format', 'wav'),
-                        'duration': tts_result.get('duration', 0),
-                        'text': response_text,
-                        'timestamp': session.last_activity.isoformat()
-                    })
-                    
-                    self.logger.info(f"TTS audio generated for response: {len(response_text)} chars")
-                else:
-                    self.logger.warning(f"TTS generation failed: {tts_result.get('error', 'Unknown error')}")
-                    
-            except Exception as tts_error:
-                self.logger.error(f"Error generating TTS audio: {tts_error}")
-                # Don't fail the whole response if TTS fails
+            # Stream audio response
+            if await self._stream_speech(websocket, session, response_text):
+                self.logger.info(f"TTS audio streamed for response: {len(response_text)} chars")
             
         except Exception as e:
             self.logger.error(f"Error processing text input: {e}")
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'error',
                 'message': f"Error processing message: {str(e)}",
-                'timestamp': session.last_activity.isoformat()
+                'timestamp': session.activity_timestamp()
             })
     
     async def _handle_system_status_query(self, websocket: WebSocket, session, message: Dict[str, Any]):
         """Handle system status query for self-awareness"""
         try:
-            from ..monitoring.self_awareness import self_awareness_monitor
+            from ..monitoring.self_awareness import get_self_awareness_monitor
             
             query_type = message.get('query_type', 'current')
             timeframe_minutes = message.get('timeframe_minutes', 10)
             
-            status_response = await self_awareness_monitor.handle_system_status_query(
+            status_response = await get_self_awareness_monitor().handle_system_status_query(
                 query_type, timeframe_minutes
             )
             
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'system_status_response',
                 **status_response
             })
             
         except Exception as e:
             self.logger.error(f"Error handling system status query: {e}")
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'system_status_response',
                 'status': 'error',
                 'metrics': {},
                 'analysis': f'Error gathering system status: {str(e)}',
                 'recommendations': ['Check system logs', 'Restart monitoring service'],
                 'alerts': [],
-                'timestamp': session.last_activity.isoformat()
+                'timestamp': session.activity_timestamp()
             })
     
     async def _handle_self_awareness_query(self, websocket: WebSocket, session, message: Dict[str, Any]):
         """Handle self-awareness capability query"""
         try:
-            from ..monitoring.self_awareness import self_awareness_monitor
+            from ..monitoring.self_awareness import get_self_awareness_monitor
             
             question = message.get('question', '')
             context = message.get('context', {})
             
-            response = await self_awareness_monitor.handle_capability_query(question, context)
+            response = await get_self_awareness_monitor().handle_capability_query(question, context)
             
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'self_awareness_response',
-                'timestamp': session.last_activity.isoformat(),
+                'timestamp': session.activity_timestamp(),
                 **response
             })
             
         except Exception as e:
             self.logger.error(f"Error handling self-awareness query: {e}")
-            await websocket.send_json({
+            await self._send_message(websocket, {
                 'type': 'self_awareness_response',
                 'answer': f'Error processing self-awareness query: {str(e)}',
                 'capability_assessment': {
@@ -413,21 +495,24 @@ class WebSocketHandler:
                     'alternatives': ['Try again later', 'Check system status']
                 },
                 'confidence': 0,
-                'timestamp': session.last_activity.isoformat()
+                'timestamp': session.activity_timestamp()
             })
     
     async def _handle_error_analysis_request(self, websocket: WebSocket, session, message: Dict[str, Any]):
         """Handle error analysis request"""
         # TODO: Implement error analysis with local LLM
-        await websocket.send_json({
-            'type': 'error_analysis_response',
-            'analysis': 'No recent errors detected in system logs',
-            'root_cause': 'System operating normally',
-            'severity': 'info',
-            'recommendations': ['Continue monitoring'],
-            'predicted_resolution_time': 'immediate',
-            'timestamp': session.last_activity.isoformat()
-        })
+        await websocket.send_text(_ERROR_ANALYSIS_TEMPLATE % session.activity_timestamp())
+
+# Dispatch table shared by all handler instances, keyed by message type
+_MESSAGE_HANDLERS = {
+    'ping': WebSocketHandler._handle_ping,
+    'change_provider': WebSocketHandler._handle_change_provider,
+    'change_model': WebSocketHandler._handle_change_model,
+    'text_input': WebSocketHandler._handle_text_input,
+    'system_status_query': WebSocketHandler._handle_system_status_query,
+    'self_awareness_query': WebSocketHandler._handle_self_awareness_query,
+    'error_analysis_request': WebSocketHandler._handle_error_analysis_request,
+}
 
 # Global WebSocket handler instance
 websocket_handler = WebSocketHandler()
\ No newline at end of file
@@ -1,67 +1,308 @@
 import whisper
 import tempfile
 import asyncio
-import subprocess
 import logging
+import io
+import os
+import hashlib
+from collections import OrderedDict
+from contextlib import suppress
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-import base64
+from typing import Dict, Any, Optional, List, Set, Union, AsyncIterator
 import wave
 import array
-import struct
+
+import av
+import numpy as np
+import torch
+
+# Whisper expects 16 kHz mono audio
+WHISPER_SAMPLE_RATE = 16000
+
+# macOS TTS output is converted to 44.1 kHz stereo
+TTS_SAMPLE_RATE = 44100
+TTS_CHANNELS = 2
+TTS_FRAME_BYTES = 2 * TTS_CHANNELS  # s16le samples for every channel
+
+# Bounds for the synthesized-speech LRU cache
+TTS_CACHE_MAX_ENTRIES = 256
+TTS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+class FFmpegPool:
+    """Bounded pool of piped FFmpeg workers.
+    
+    Input is fed on stdin and output read from stdout, so conversions never
+    touch the disk. Concurrency is capped at the CPU count.
+    """
+    
+    PIPE_LIMIT = 1 << 20  # 1 MiB stream buffers instead of the 64 KiB default
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._semaphore = None
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+    
+    def _build_command(self, output_args: List[str]) -> List[str]:
+        return [
+            'ffmpeg',
+            '-hide_banner',
+            '-loglevel', 'error',
+            '-i', 'pipe:0',
+            *output_args,
+            'pipe:1'
+        ]
+    
+    async def _spawn(self, output_args: List[str]) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            *self._build_command(output_args),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=self.PIPE_LIMIT
+        )
+    
+    async def run(self, input_data: bytes, output_args: List[str]) -> bytes:
+        """Run one conversion from stdin to stdout and return the output bytes"""
+        async with self._get_semaphore():
+            process = await self._spawn(output_args)
+            stdout, stderr = await process.communicate(input_data)
+        
+        if process.returncode != 0:
+            raise Exception(f"FFmpeg conversion failed: {stderr.decode()}")
+        
+        return stdout
+    
+    async def stream(self, input_data: bytes, output_args: List[str],
+                     chunk_size: int) -> AsyncIterator[bytes]:
+        """Run one conversion and yield stdout in fixed-size chunks as produced"""
+        async with self._get_semaphore():
+            process = await self._spawn(output_args)
+            
+            async def feed_stdin():
+                try:
+                    # If FFmpeg exits early, its exit status and stderr are
+                    # reported below instead of the broken pipe
+                    with suppress(BrokenPipeError, ConnectionResetError):
+                        process.stdin.write(input_data)
+                        await process.stdin.drain()
+                finally:
+                    process.stdin.close()
+            
+            writer = asyncio.ensure_future(feed_stdin())
+            try:
+                while True:
+                    try:
+                        yield await process.stdout.readexactly(chunk_size)
+                    except asyncio.IncompleteReadError as e:
+                        if e.partial:
+                            yield e.partial
+                        break
+                
+                await writer
+                stderr = await process.stderr.read()
+                if await process.wait() != 0:
+                    raise Exception(f"FFmpeg conversion failed: {stderr.decode()}")
+            finally:
+                # The consumer may stop early (e.g. client disconnected)
+                writer.cancel()
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+def _load_whisper_model(model_size: str, device: Optional[str] = None):
+    """Load a Whisper model, on the GPU when one is available"""
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    return whisper.load_model(model_size, device=device)
+
+# Whisper models loaded inside a transcription worker process, keyed by size
+_worker_models: Dict[str, Any] = {}
+_worker_device: Optional[str] = None  # Device assigned to this worker process
+
+def _get_worker_model(model_size: str):
+    """Get (loading on first use) this worker process's Whisper model"""
+    model = _worker_models.get(model_size)
+    if model is None:
+        model = _worker_models[model_size] = _load_whisper_model(model_size, _worker_device)
+    return model
+
+def _init_worker(model_size: str, worker_counter):
+    """Pool initializer: pick this worker's GPU and load the model before any job"""
+    global _worker_device
+    # Workers take GPUs in start order, so each one gets its own device
+    with worker_counter.get_lock():
+        index = worker_counter.value
+        worker_counter.value += 1
+    if torch.cuda.is_available():
+        _worker_device = f"cuda:{index % torch.cuda.device_count()}"
+    else:
+        _worker_device = "cpu"
+    _get_worker_model(model_size)
+
+def _worker_ready(model_size: str) -> bool:
+    """No-op job used to start a worker process; reports whether its model is loaded"""
+    return model_size in _worker_models
+
+def _transcribe_in_worker(model_size: str, pcm: np.ndarray, language: Optional[str]) -> Dict[str, Any]:
+    """Normalize int16 PCM to float32 and run Whisper (worker process)"""
+    model = _get_worker_model(model_size)
+    audio = pcm.astype(np.float32) / 32768.0
+    
+    return model.transcribe(
+        audio,
+        fp16=model.device.type == 'cuda',
+        language=language
+    )
 
 class SpeechProcessor:
     """Handle speech-to-text and text-to-speech processing"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.whisper_model = None
+        self.loaded_model_size = None  # Size currently serving transcriptions
         self.model_size = "base"  # base, small, medium, large
+        self.language = "en"  # Skip Whisper's language-detection pass
+        self._reload_task = None
+        self._executor = None
+        self._worker_count = 0
+        self._ffmpeg = FFmpegPool()
+        self._tts_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._tts_cache_bytes = 0
         self.temp_dir = Path(tempfile.gettempdir()) / "voice_assistant"
         self.temp_dir.mkdir(exist_ok=True)
+        self._live_temp_files: Set[Path] = set()  # Temp files currently in use
         
     async def initialize(self):
         """Initialize the speech processor"""
         try:
-            # Load Whisper model asynchronously
-            loop = asyncio.get_event_loop()
-            self.whisper_model = await loop.run_in_executor(
-                None, whisper.load_model, self.model_size
-            )
+            # Whisper runs in dedicated worker processes so its Python-side
+            # work never contends for the server's GIL; spawn keeps CUDA safe
+            self._worker_count = self._transcription_worker_count()
+            executor = self._create_executor(self.model_size)
+            
+            # Load Whisper model at startup so the first transcription is warm
+            try:
+                await self._start_workers(executor, self.model_size)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            self._executor = executor
+            self.loaded_model_size = self.model_size
             self.logger.info(f"Whisper model '{self.model_size}' loaded successfully")
             return True
         except Exception as e:
             self.logger.error(f"Failed to initialize speech processor: {e}")
             return False
     
-    async def transcribe_audio(self, audio_data: bytes, 
-                             audio_format: str = "wav") -> Dict[str, Any]:
-        """Transcribe audio data to text using Whisper"""
+    def _transcription_worker_count(self) -> int:
+        """One worker per GPU (at most two), or a single CPU worker"""
+        return max(1, min(2, torch.cuda.device_count()))
+    
+    def _create_executor(self, model_size: str) -> ProcessPoolExecutor:
+        """Create a transcription pool whose workers each load model_size on start"""
+        mp_context = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(
+            max_workers=self._worker_count,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(model_size, mp_context.Value('i', 0))
+        )
+    
+    async def _start_workers(self, executor: ProcessPoolExecutor, model_size: str):
+        """Warm up a new pool by running one no-op job per worker"""
+        # The jobs usually start every worker now, but the pool may run several
+        # on one process; either way the initializer loads the model in each
+        # worker, whenever it starts, before it takes a job
+        loop = asyncio.get_event_loop()
+        ready = await asyncio.gather(*[
+            loop.run_in_executor(executor, _worker_ready, model_size)
+            for _ in range(self._worker_count)
+        ])
+        if not all(ready):
+            raise Exception(f"Whisper model '{model_size}' not loaded in every worker")
+    
+    async def _reload_model(self, model_size: str):
+        """Load a new Whisper model in a fresh pool and swap it in once ready"""
+        executor = self._create_executor(model_size)
         try:
-            if not self.whisper_model:
+            await self._start_workers(executor, model_size)
+            
+            # A newer size may have been requested, or cleanup run, while loading
+            if model_size == self.model_size and self._executor is not None:
+                executor, self._executor = self._executor, executor
+                self.loaded_model_size = model_size
+                self.logger.info(f"Whisper model '{model_size}' loaded successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to load Whisper model '{model_size}': {e}")
+        finally:
+            # Retire whichever pool is not serving; in-flight transcriptions finish first
+            executor.shutdown(wait=False)
+    
+    def create_resampler(self) -> av.audio.resampler.AudioResampler:
+        """Create a resampler targeting Whisper's 16 kHz mono s16 input"""
+        return av.audio.resampler.AudioResampler(
+            format='s16', layout='mono', rate=WHISPER_SAMPLE_RATE
+        )
+    
+    async def decode_audio(self, audio_data: bytes) -> np.ndarray:
+        """Decode WebM/Opus audio to 16 kHz mono int16 PCM"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._decode_to_pcm, audio_data)
+    
+    def _decode_to_pcm(self, audio_data: bytes) -> np.ndarray:
+        """Decode and resample audio in-process with PyAV (no ffmpeg subprocess)"""
+        # One resampler per utterance: it must be flushed to emit the final
+        # samples, and flushing ends its filter graph
+        resampler = self.create_resampler()
+        
+        # The browser always records WebM, so skip container probing
+        with av.open(io.BytesIO(audio_data), format='webm') as container:
+            stream = container.streams.audio[0]
+            chunks = [
+                resampled.to_ndarray().reshape(-1)
+                for frame in container.decode(stream)
+                for resampled in resampler.resample(frame)
+            ]
+        
+        # Flush samples still buffered in the resampler
+        chunks.extend(frame.to_ndarray().reshape(-1) for frame in resampler.resample(None))
+        
+        if not chunks:
+            return np.zeros(0, dtype=np.int16)
+        return np.concatenate(chunks)
+    
+    async def transcribe_audio(self, pcm: Union[np.ndarray, bytes],
+                             sample_rate: int = WHISPER_SAMPLE_RATE) -> Dict[str, Any]:
+        """Transcribe 16 kHz mono int16 PCM (array or raw bytes) using Whisper"""
+        try:
+            if not self.loaded_model_size:
                 raise Exception("Whisper model not initialized")
             
-            # Save audio data to temporary file
-            temp_audio_file = self.temp_dir / f"temp_audio_{asyncio.current_task().get_name()}.{audio_format}"
+            if sample_rate != WHISPER_SAMPLE_RATE:
+                raise Exception(f"Unsupported sample rate {sample_rate}, expected {WHISPER_SAMPLE_RATE}")
             
-            with open(temp_audio_file, 'wb') as f:
-                f.write(audio_data)
+            if isinstance(pcm, bytes):
+                pcm = np.frombuffer(pcm, dtype=np.int16)
             
-            # Transcribe using Whisper
+            # Transcribe in memory; Whisper skips its own ffmpeg call for arrays
             loop = asyncio.get_event_loop()
             result = await loop.run_in_executor(
-                None, self.whisper_model.transcribe, str(temp_audio_file)
+                self._executor, _transcribe_in_worker,
+                self.loaded_model_size, pcm, self.language
             )
             
-            # Clean up temp file
-            temp_audio_file.unlink(missing_ok=True)
-            
             return {
                 'text': result['text'].strip(),
                 'confidence': self._calculate_confidence(result),
                 'language': result.get('language', 'en'),
                 'segments': result.get('segments', []),
-                'duration': result.get('duration', 0)
+                'duration': len(pcm) / sample_rate
             }
             
         except Exception as e:
@@ -82,15 +323,13 @@ class SpeechProcessor:
             if not segments:
                 return 0.0
             
-            # Average the no_speech_prob across segments (lower is better)
-            total_confidence = 0.0
-            for segment in segments:
-                # Convert no_speech_prob to confidence (invert and scale)
-                no_speech_prob = segment.get('no_speech_prob', 0.5)
-                confidence = (1.0 - no_speech_prob) * 100
-                total_confidence += confidence
-            
-            return total_confidence / len(segments)
+            # Average the no_speech_prob across segments (lower is better),
+            # then invert and scale it to a confidence percentage
+            no_speech_probs = np.fromiter(
+                (segment.get('no_speech_prob', 0.5) for segment in segments),
+                dtype=np.float64, count=len(segments)
+            )
+            return float((1.0 - no_speech_probs.mean()) * 100.0)
             
         except Exception:
             return 50.0  # Default confidence
@@ -102,43 +341,11 @@ class SpeechProcessor:
             if not text.strip():
                 raise Exception("Empty text provided")
             
-            # Create temporary files
-            temp_aiff_file = self.temp_dir / f"temp_tts_{hash(text)}.aiff"
-            temp_wav_file = self.temp_dir / f"temp_tts_{hash(text)}.wav"
-            
-            # Use macOS 'say' command to generate AIFF file
-            say_command = [
-                'say',
-                '-v', voice,
-                '-r', str(rate),
-                '-o', str(temp_aiff_file),
-                text
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *say_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                raise Exception(f"TTS generation failed: {stderr.decode()}")
-            
-            # Convert AIFF to WAV using FFmpeg
-            await self._convert_aiff_to_wav(temp_aiff_file, temp_wav_file)
-            
-            # Read the WAV file
-            with open(temp_wav_file, 'rb') as f:
-                audio_data = f.read()
+            pcm_data = await self._synthesize_pcm(text, voice, rate)
+            audio_data = self._pcm_to_wav(pcm_data, TTS_SAMPLE_RATE, TTS_CHANNELS)
             
             # Get audio info
-            audio_info = self._get_audio_info(temp_wav_file)
-            
-            # Clean up temp files
-            temp_aiff_file.unlink(missing_ok=True)
-            temp_wav_file.unlink(missing_ok=True)
+            audio_info = self._get_audio_info(pcm_data, TTS_SAMPLE_RATE, TTS_CHANNELS)
             
             return {
                 'audio_data': audio_data,
@@ -161,86 +368,183 @@ class SpeechProcessor:
                 'error': str(e)
             }
     
-    async def _convert_aiff_to_wav(self, aiff_file: Path, wav_file: Path):
-        """Convert AIFF to WAV using FFmpeg"""
+    async def stream_speech(self, text: str, voice: str = "Alex", rate: int = 200,
+                            chunk_ms: int = 50) -> AsyncIterator[bytes]:
+        """Synthesize speech and yield raw PCM chunks as they are produced.
+        
+        Chunks are s16le at TTS_SAMPLE_RATE/TTS_CHANNELS and always hold whole
+        frames. Raises if synthesis fails.
+        """
+        if not text.strip():
+            raise Exception("Empty text provided")
+        
+        chunk_size = TTS_SAMPLE_RATE * chunk_ms // 1000 * TTS_FRAME_BYTES
+        cache_key = self._tts_cache_key(text, voice, rate)
+        
+        cached = self._get_cached_pcm(cache_key)
+        if cached is not None:
+            for offset in range(0, len(cached), chunk_size):
+                yield cached[offset:offset + chunk_size]
+            return
+        
+        # 'say' only writes finished files, so streaming starts at the
+        # FFmpeg stage and chunks are forwarded as soon as it emits them
+        aiff_data = await self._render_aiff(text, voice, rate)
+        chunks = []
+        stream = self._ffmpeg.stream(aiff_data, self._pcm_output_args(), chunk_size)
         try:
-            ffmpeg_command = [
-                'ffmpeg',
-                '-i', str(aiff_file),
-                '-acodec', 'pcm_s16le',
-                '-ar', '44100',
-                '-ac', '2',
-                '-y',  # Overwrite output file
-                str(wav_file)
-            ]
-            
-            process = await asyncio.create_subprocess_exec(
-                *ffmpeg_command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                raise Exception(f"FFmpeg conversion failed: {stderr.decode()}")
+            async for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Release the FFmpeg slot and process now if the consumer stops early
+            await stream.aclose()
+        
+        self._cache_tts_pcm(cache_key, b''.join(chunks))
+    
+    async def _synthesize_pcm(self, text: str, voice: str, rate: int) -> bytes:
+        """Get raw PCM for text, from the cache or by rendering it"""
+        cache_key = self._tts_cache_key(text, voice, rate)
+        
+        # Repeated phrases are served from the cache without any subprocess
+        cached = self._get_cached_pcm(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Render with 'say', then pipe the AIFF through FFmpeg to raw PCM
+        aiff_data = await self._render_aiff(text, voice, rate)
+        pcm_data = await self._convert_aiff_to_pcm(aiff_data)
+        self._cache_tts_pcm(cache_key, pcm_data)
+        return pcm_data
+    
+    def _tts_cache_key(self, text: str, voice: str, rate: int) -> tuple:
+        return (voice, rate, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+    
+    def _get_cached_pcm(self, cache_key: tuple) -> Optional[bytes]:
+        pcm_data = self._tts_cache.get(cache_key)
+        if pcm_data is not None:
+            self._tts_cache.move_to_end(cache_key)
+        return pcm_data
+    
+    def _cache_tts_pcm(self, cache_key: tuple, pcm_data: bytes):
+        """Store synthesized PCM, evicting least recently used entries"""
+        size = len(pcm_data)
+        if size > TTS_CACHE_MAX_BYTES:
+            return
+        
+        # Concurrent misses for the same text may both land here
+        previous = self._tts_cache.pop(cache_key, None)
+        if previous is not None:
+            self._tts_cache_bytes -= len(previous)
+        
+        self._tts_cache[cache_key] = pcm_data
+        self._tts_cache_bytes += size
+        
+        while (len(self._tts_cache) > TTS_CACHE_MAX_ENTRIES or
+               self._tts_cache_bytes > TTS_CACHE_MAX_BYTES):
+            _, evicted = self._tts_cache.popitem(last=False)
+            self._tts_cache_bytes -= len(evicted)
+    
+    async def _render_aiff(self, text: str, voice: str, rate: int) -> bytes:
+        """Render text to AIFF bytes with the macOS 'say' command"""
+        # 'say' can only write to a file; the temp file is unique per call
+        # and removed on exit, even when synthesis fails
+        with tempfile.NamedTemporaryFile(prefix='temp_tts_', suffix='.aiff',
+                                         dir=self.temp_dir) as temp_aiff_file:
+            temp_path = Path(temp_aiff_file.name)
+            self._live_temp_files.add(temp_path)
+            try:
+                say_command = [
+                    'say',
+                    '-v', voice,
+                    '-r', str(rate),
+                    '-o', temp_aiff_file.name,
+                    text
+                ]
                 
-        except Exception as e:
-            self.logger.error(f"Error converting AIFF to WAV: {e}")
-            raise
+                process = await asyncio.create_subprocess_exec(
+                    *say_command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                
+                stdout, stderr = await process.communicate()
+                
+                if process.returncode != 0:
+                    raise Exception(f"TTS generation failed: {stderr.decode()}")
+                
+                with open(temp_aiff_file.name, 'rb') as f:
+                    return f.read()
+            finally:
+                self._live_temp_files.discard(temp_path)
     
-    def _get_audio_info(self, wav_file: Path) -> Dict[str, Any]:
-        """Get audio file information"""
+    async def _convert_aiff_to_pcm(self, aiff_data: bytes) -> bytes:
+        """Convert AIFF to raw 16-bit PCM using FFmpeg"""
         try:
-            with wave.open(str(wav_file), 'rb') as wav:
-                frames = wav.getnframes()
-                sample_rate = wav.getframerate()
-                duration = frames / sample_rate
-                channels = wav.getnchannels()
-                
-                return {
-                    'duration': duration,
-                    'sample_rate': sample_rate,
-                    'channels': channels,
-                    'frames': frames
-                }
+            return await self._ffmpeg.run(aiff_data, self._pcm_output_args())
         except Exception as e:
-            self.logger.error(f"Error getting audio info: {e}")
-            return {}
+            self.logger.error(f"Error converting AIFF to PCM: {e}")
+            raise
+    
+    def _pcm_output_args(self) -> List[str]:
+        """FFmpeg output options for raw TTS PCM"""
+        return [
+            '-f', 's16le',
+            '-acodec', 'pcm_s16le',
+            '-ar', str(TTS_SAMPLE_RATE),
+            '-ac', str(TTS_CHANNELS),
+        ]
+    
+    def _pcm_to_wav(self, pcm_data: bytes, sample_rate: int, channels: int) -> bytes:
+        """Wrap raw 16-bit PCM in a WAV container"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm_data)
+        return buffer.getvalue()
+    
+    def _get_audio_info(self, pcm_data: bytes, sample_rate: int, channels: int) -> Dict[str, Any]:
+        """Get audio information for raw 16-bit PCM"""
+        frames = len(pcm_data) // (2 * channels)
+        return {
+            'duration': frames / sample_rate,
+            'sample_rate': sample_rate,
+            'channels': channels,
+            'frames': frames
+        }
     
     async def process_audio_level(self, audio_data: bytes) -> float:
         """Calculate audio level for VU meter"""
         try:
-            # Simple RMS calculation for audio level
-            if len(audio_data) < 2:
+            # Interpret bytes as little-endian 16-bit samples
+            samples = np.frombuffer(audio_data, dtype='<i2', count=len(audio_data) // 2)
+            if samples.size == 0:
                 return -60.0  # Very quiet
             
-            # Convert bytes to 16-bit integers
-            sample_count = len(audio_data) // 2
-            samples = struct.unpack(f'<{sample_count}h', audio_data[:sample_count*2])
+            # Calculate RMS in a single vectorized pass
+            rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float32))))
             
-            # Calculate RMS
-            if samples:
-                rms = (sum(sample ** 2 for sample in samples) / len(samples)) ** 0.5
-                
-                # Convert to dB
-                if rms > 0:
-                    db_level = 20 * (rms / 32767.0)  # Normalize to 16-bit range
-                    return max(-60.0, min(0.0, db_level))  # Clamp between -60dB and 0dB
-            
-            return -60.0
+            # Convert to dBFS relative to the 16-bit full-scale range
+            db_level = 20 * np.log10(max(rms, 1.0) / 32767.0)
+            return float(max(-60.0, min(0.0, db_level)))  # Clamp between -60dB and 0dB
                 
         except Exception as e:
             self.logger.error(f"Error calculating audio level: {e}")
             return -60.0
     
-    def get_available_voices(self) -> List[str]:
+    async def get_available_voices(self) -> List[str]:
         """Get available macOS TTS voices"""
         try:
-            result = subprocess.run(['say', '-v', '?'], 
-                                  capture_output=True, text=True)
+            process = await asyncio.create_subprocess_exec(
+                'say', '-v', '?',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, _ = await process.communicate()
             voices = []
-            for line in result.stdout.split('\n'):
+            for line in stdout.decode().split('\n'):
                 if line.strip():
                     # Extract voice name (first word)
                     voice_name = line.split()[0]
@@ -254,8 +558,13 @@ class SpeechProcessor:
         """Set Whisper model size"""
         valid_sizes = ["tiny", "base", "small", "medium", "large"]
         if size in valid_sizes:
+            if size == self.model_size:
+                return True
             self.model_size = size
-            self.whisper_model = None  # Will reload on next transcription
+            if self._executor is None:
+                return True  # Loaded by initialize()
+            # Keep the current model serving until the new one has loaded
+            self._reload_task = asyncio.get_event_loop().create_task(self._reload_model(size))
             self.logger.info(f"Whisper model size set to: {size}")
             return True
         return False
@@ -263,9 +572,23 @@ class SpeechProcessor:
     async def cleanup(self):
         """Clean up temporary files and resources"""
         try:
-            # Clean up temp directory
-            for temp_file in self.temp_dir.glob("temp_*"):
+            # Remove temp files still held by in-flight synthesis
+            for temp_file in list(self._live_temp_files):
                 temp_file.unlink(missing_ok=True)
+            self._live_temp_files.clear()
+            
+            if self._reload_task is not None and not self._reload_task.done():
+                self._reload_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self._reload_task
+            self._reload_task = None
+            
+            # Stop the transcription workers, waiting off the event loop for
+            # the processes to exit
+            if self._executor is not None:
+                executor, self._executor = self._executor, None
+                self.loaded_model_size = None
+                await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
             
             self.logger.info("Speech processor cleanup completed")
         except Exception as e:
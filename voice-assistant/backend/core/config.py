@@ -1,29 +1,57 @@
 import os
-import json
+import atexit
+import queue
+import orjson
 from pathlib import Path
 from typing import Dict, Optional
 import logging
+import logging.handlers
+
+# Set once the process-wide logging handlers have been installed
+_LOGGING_CONFIGURED = False
+
+# Loggers on the per-request path; INFO records from them are opt-in
+# (set VERBOSE_REQUEST_LOGS=1)
+_REQUEST_PATH_LOGGERS = ("backend.llm.provider_manager", "backend.api.websocket_handler")
 
 class ConfigManager:
     def __init__(self):
         self.base_path = Path(__file__).parent.parent.parent
         self.keys_path = self.base_path / "config" / "keys"
         self.settings_path = self.base_path / "config" / "settings"
+        self.settings_file = self.settings_path / "config.json"
         self.api_keys = {}
+        self._settings = {}
+        self._settings_mtime = None
         self._setup_logging()
         self._load_api_keys()
+        self._load_settings()
     
     def _setup_logging(self):
+        global _LOGGING_CONFIGURED
         self.logger = logging.getLogger(__name__)
-        if not self.logger.handlers:
-            logging.basicConfig(
-                level=logging.INFO,
-                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                handlers=[
-                    logging.FileHandler('voice_assistant.log'),
-                    logging.StreamHandler()
-                ]
-            )
+        if not _LOGGING_CONFIGURED:
+            _LOGGING_CONFIGURED = True
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler = logging.FileHandler('voice_assistant.log')
+            stream_handler = logging.StreamHandler()
+            file_handler.setFormatter(formatter)
+            stream_handler.setFormatter(formatter)
+            
+            # Callers only enqueue records; formatting and file/console I/O
+            # happen on the listener's background thread
+            log_queue = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+            listener.start()
+            atexit.register(listener.stop)
+            
+            root_logger = logging.getLogger()
+            root_logger.setLevel(logging.INFO)
+            root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            
+            if not os.getenv("VERBOSE_REQUEST_LOGS"):
+                for name in _REQUEST_PATH_LOGGERS:
+                    logging.getLogger(name).setLevel(logging.WARNING)
     
     def _load_api_keys(self):
         """Load API keys from key files"""
@@ -34,16 +62,18 @@ class ConfigManager:
         }
         
         for provider, filename in key_files.items():
-            key_file = self.keys_path / filename
-            if key_file.exists():
-                try:
-                    with open(key_file, 'r') as f:
-                        key = f.read().strip()
-                        if key:
-                            self.api_keys[provider] = key
-                            self.logger.info(f"Loaded {provider} API key")
-                except Exception as e:
-                    self.logger.error(f"Error loading {provider} key: {e}")
+            # Read directly; a missing key file is not an error
+            try:
+                key = (self.keys_path / filename).read_text().strip()
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.logger.error(f"Error loading {provider} key: {e}")
+                continue
+            
+            if key:
+                self.api_keys[provider] = key
+                self.logger.info(f"Loaded {provider} API key")
     
     def get_api_key(self, provider: str) -> Optional[str]:
         """Get API key for a provider"""
@@ -53,17 +83,37 @@ class ConfigManager:
         """Check if API key exists for provider"""
         return provider.lower() in self.api_keys
     
+    def _load_settings(self):
+        """Load settings from config.json and remember its modification time"""
+        try:
+            mtime = os.stat(self.settings_file).st_mtime
+        except FileNotFoundError:
+            self._settings = {}
+            self._settings_mtime = None
+            return
+        
+        try:
+            with open(self.settings_file, 'rb') as f:
+                self._settings = orjson.loads(f.read())
+        except Exception as e:
+            self.logger.error(f"Error reading settings: {e}")
+            self._settings = {}
+        # Recorded even on failure so a broken file is only re-read once edited
+        self._settings_mtime = mtime
+    
+    def _maybe_reload(self):
+        """Reload settings only if config.json changed since the last load"""
+        try:
+            mtime = os.stat(self.settings_file).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._settings_mtime:
+            self._load_settings()
+    
     def get_setting(self, key: str, default=None):
         """Get a configuration setting"""
-        settings_file = self.settings_path / "config.json"
-        if settings_file.exists():
-            try:
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
-                    return settings.get(key, default)
-            except Exception as e:
-                self.logger.error(f"Error reading settings: {e}")
-        return default
+        self._maybe_reload()
+        return self._settings.get(key, default)
 
 # Global config instance
 config = ConfigManager()
\ No newline at end of file
@@ -0,0 +1,24 @@
+import aiohttp
+from typing import Optional
+
+# Connection pool shared by every aiohttp-based client in the process
+_connector: Optional[aiohttp.TCPConnector] = None
+
+def get_connector() -> aiohttp.TCPConnector:
+    """Get the shared TCP connector, creating it on first use"""
+    global _connector
+    if _connector is None or _connector.closed:
+        _connector = aiohttp.TCPConnector(
+            limit=100,
+            ttl_dns_cache=300,
+            use_dns_cache=True,
+            keepalive_timeout=60
+        )
+    return _connector
+
+async def close_connector():
+    """Close the shared TCP connector"""
+    global _connector
+    if _connector is not None and not _connector.closed:
+        await _connector.close()
+    _connector = None
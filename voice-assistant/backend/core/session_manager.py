@@ -1,23 +1,34 @@
-import uuid
 import asyncio
+import secrets
 import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import suppress
 from typing import Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 
 class Session:
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.created_at = datetime.now()
-        self.last_activity = datetime.now()
+        # Monotonic clock for expiry checks; wall-clock time kept for timestamps
+        self.last_activity = time.monotonic()
+        self._last_activity_wall = time.time()
         self.websocket = None
         self.user_data = {}
-        self.conversation_history = []
+        # Only the last 10 turns are kept to manage memory
+        self.conversation_history = deque(maxlen=10)
         self.current_provider = None
         self.current_model = None
         self.audio_settings = {}
         
     def update_activity(self):
-        self.last_activity = datetime.now()
+        self.last_activity = time.monotonic()
+        self._last_activity_wall = time.time()
+    
+    def activity_timestamp(self) -> str:
+        """ISO 8601 wall-clock time of the last activity"""
+        return datetime.fromtimestamp(self._last_activity_wall).isoformat()
     
     def add_conversation_turn(self, user_message: str, assistant_response: str, provider: str, model: str):
         self.conversation_history.append({
@@ -27,30 +38,41 @@ class Session:
             'provider': provider,
             'model': model
         })
-        # Keep only last 10 turns to manage memory
-        if len(self.conversation_history) > 10:
-            self.conversation_history = self.conversation_history[-10:]
 
 class SessionManager:
     def __init__(self):
         self.sessions: Dict[str, Session] = {}
+        # Session IDs ordered from least to most recently active
+        self._by_activity: "OrderedDict[str, float]" = OrderedDict()
         self.logger = logging.getLogger(__name__)
         self._cleanup_task = None
-        self._start_cleanup_task()
     
-    def _start_cleanup_task(self):
+    async def start(self):
         """Start background task to clean up expired sessions"""
-        async def cleanup():
-            while True:
-                await asyncio.sleep(300)  # Check every 5 minutes
-                await self.cleanup_expired_sessions()
-        
-        self._cleanup_task = asyncio.create_task(cleanup())
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    
+    async def stop(self):
+        """Stop the background cleanup task"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._cleanup_task
+            self._cleanup_task = None
+    
+    async def _cleanup_loop(self):
+        """Periodically remove expired sessions"""
+        while True:
+            await asyncio.sleep(300)  # Check every 5 minutes
+            await self.cleanup_expired_sessions()
     
     def create_session(self) -> str:
         """Create a new session and return session ID"""
-        session_id = str(uuid.uuid4())
-        self.sessions[session_id] = Session(session_id)
+        # 128 random bits as hex, without building a UUID object
+        session_id = secrets.token_hex(16)
+        session = Session(session_id)
+        self.sessions[session_id] = session
+        self._by_activity[session_id] = session.last_activity
         self.logger.info(f"Created new session: {session_id}")
         return session_id
     
@@ -59,6 +81,8 @@ class SessionManager:
         session = self.sessions.get(session_id)
         if session:
             session.update_activity()
+            self._by_activity[session_id] = session.last_activity
+            self._by_activity.move_to_end(session_id)
         return session
     
     def remove_session(self, session_id: str):
@@ -68,32 +92,40 @@ class SessionManager:
             if session.websocket:
                 asyncio.create_task(session.websocket.close())
             del self.sessions[session_id]
+            self._by_activity.pop(session_id, None)
             self.logger.info(f"Removed session: {session_id}")
     
     async def cleanup_expired_sessions(self):
         """Remove sessions that haven't been active for over an hour"""
-        cutoff_time = datetime.now() - timedelta(hours=1)
-        expired_sessions = [
-            session_id for session_id, session in self.sessions.items()
-            if session.last_activity < cutoff_time
-        ]
+        cutoff_time = time.monotonic() - 3600
         
-        for session_id in expired_sessions:
+        # Only the stale prefix of the activity index needs to be visited
+        while self._by_activity:
+            session_id, last_activity = next(iter(self._by_activity.items()))
+            if last_activity >= cutoff_time:
+                break
             self.remove_session(session_id)
+            self._by_activity.pop(session_id, None)
             self.logger.info(f"Cleaned up expired session: {session_id}")
     
     def get_session_count(self) -> int:
         """Get the number of active sessions"""
         return len(self.sessions)
     
-    async def broadcast_to_all(self, message: dict):
-        """Send message to all active sessions"""
-        for session in self.sessions.values():
-            if session.websocket:
+    async def broadcast_to_all(self, message: dict, max_concurrent: int = 32):
+        """Send message to all active sessions concurrently"""
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def send(session: Session):
+            async with semaphore:
                 try:
                     await session.websocket.send_json(message)
                 except Exception as e:
                     self.logger.error(f"Error broadcasting to session {session.session_id}: {e}")
+        
+        # Snapshot targets so sessions added or removed mid-broadcast are safe
+        targets = [session for session in tuple(self.sessions.values()) if session.websocket]
+        await asyncio.gather(*(send(session) for session in targets))
 
 # Global session manager instance
 session_manager = SessionManager()
\ No newline at end of file
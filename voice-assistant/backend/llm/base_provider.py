@@ -1,7 +1,34 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+import functools
 import logging
-import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant."
+
+# Personality.txt lives at the repository root, above voice-assistant/backend/llm/
+_PERSONALITY_FILE = Path(__file__).resolve().parents[3] / 'Personality.txt'
+
+@functools.lru_cache(maxsize=1)
+def _load_personality_prompt() -> str:
+    """Load personality prompt from Personality.txt once per process"""
+    try:
+        content = _PERSONALITY_FILE.read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        content = ''
+    except Exception as e:
+        logger.error(f"Error loading personality prompt: {e}")
+        return DEFAULT_SYSTEM_PROMPT
+    
+    if content:
+        logger.info(f"Loaded personality prompt from {_PERSONALITY_FILE}")
+        return content
+    
+    # Fallback to default system prompt
+    logger.warning(f"Personality file not found or empty at {_PERSONALITY_FILE}, using default prompt")
+    return DEFAULT_SYSTEM_PROMPT
 
 class BaseLLMProvider(ABC):
     """Abstract base class for all LLM providers"""
@@ -10,10 +37,13 @@ class BaseLLMProvider(ABC):
         self.name = name
         self.api_key = api_key
         self.current_model = None
-        self.available_models = []
+        self.available_models: Tuple[Mapping[str, Any], ...] = ()
+        self._models_by_id: Dict[str, Mapping[str, Any]] = {}  # Filled by subclasses
         self.logger = logging.getLogger(f"{__name__}.{name}")
         self.is_healthy = False
-        self._personality_prompt = self._load_personality_prompt()
+        self._personality_prompt = _load_personality_prompt()
+        # Shared by every request; never mutate it
+        self._system_message = {"role": "system", "content": self._personality_prompt}
     
     @abstractmethod
     async def chat(self, message: str, history: List[Dict[str, str]] = None, model: str = None) -> str:
@@ -26,8 +56,8 @@ class BaseLLMProvider(ABC):
         pass
     
     @abstractmethod
-    def get_available_models(self) -> List[Dict[str, Any]]:
-        """Get list of available models for this provider"""
+    def get_available_models(self) -> Tuple[Mapping[str, Any], ...]:
+        """Get the read-only tuple of available models for this provider"""
         pass
     
     @abstractmethod
@@ -35,6 +65,10 @@ class BaseLLMProvider(ABC):
         """Set the current model for this provider"""
         pass
     
+    async def close(self):
+        """Release resources held by the provider (can be overridden)"""
+        pass
+    
     def get_current_model(self) -> Optional[str]:
         """Get the currently selected model"""
         return self.current_model
@@ -62,47 +96,19 @@ class BaseLLMProvider(ABC):
     
     def format_conversation_history(self, history: List[Dict[str, str]]) -> List[Dict[str, str]]:
         """Format conversation history for this provider (can be overridden)"""
-        if not history:
-            return []
-        
         formatted = []
-        for turn in history:
-            if 'user' in turn and 'assistant' in turn:
-                formatted.extend([
-                    {"role": "user", "content": turn['user']},
-                    {"role": "assistant", "content": turn['assistant']}
-                ])
+        append = formatted.append
+        for turn in history or ():
+            user = turn.get('user')
+            assistant = turn.get('assistant')
+            if user is not None and assistant is not None:
+                append({"role": "user", "content": user})
+                append({"role": "assistant", "content": assistant})
         return formatted
     
-    def get_model_info(self, model_id: str) -> Optional[Dict[str, Any]]:
+    def get_model_info(self, model_id: str) -> Optional[Mapping[str, Any]]:
         """Get information about a specific model"""
-        for model in self.available_models:
-            if model['id'] == model_id:
-                return model
-        return None
-    
-    def _load_personality_prompt(self) -> str:
-        """Load personality prompt from Personality.txt file"""
-        try:
-            # Get the project root directory (assuming the backend is in voice-assistant/backend/)
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-            personality_file = os.path.join(project_root, 'Personality.txt')
-            
-            if os.path.exists(personality_file):
-                with open(personality_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:
-                        self.logger.info(f"Loaded personality prompt from {personality_file}")
-                        return content
-            
-            # Fallback to default system prompt
-            self.logger.warning(f"Personality file not found or empty at {personality_file}, using default prompt")
-            return "You are a helpful AI assistant."
-            
-        except Exception as e:
-            self.logger.error(f"Error loading personality prompt: {e}")
-            return "You are a helpful AI assistant."
+        return self._models_by_id.get(model_id)
     
     def get_system_prompt(self) -> str:
         """Get the system prompt (personality) for the LLM"""
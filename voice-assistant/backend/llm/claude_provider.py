@@ -1,45 +1,42 @@
 import anthropic
-from typing import List, Dict, Any, Optional
+import httpx
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from .base_provider import BaseLLMProvider
 
 class ClaudeProvider(BaseLLMProvider):
     """Anthropic Claude provider"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
         super().__init__("Claude", api_key)
-        self.client = anthropic.AsyncAnthropic(api_key=api_key)
-        self._models = [
+        self.client = anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client)
+        # Read-only model table shared with callers without copying
+        self._models = tuple(MappingProxyType(model) for model in [
             {"id": "claude-3-5-sonnet-20241022", "name": "Claude 3.5 Sonnet", "available": True, "cost_tier": "high"},
             {"id": "claude-3-haiku-20240307", "name": "Claude 3 Haiku", "available": True, "cost_tier": "low"},
             {"id": "claude-3-opus-20240229", "name": "Claude 3 Opus", "available": False, "cost_tier": "high"}  # Limited availability
-        ]
+        ])
+        self._models_by_id = {model['id']: model for model in self._models}
     
     async def chat(self, message: str, history: List[Dict[str, str]] = None, model: str = None) -> str:
         """Send chat message to Claude"""
         try:
             model_to_use = model or self.current_model or "claude-3-5-sonnet-20241022"
             
-            # Build messages array (Claude format)
-            messages = []
-            
-            # Add conversation history
-            if history:
-                for turn in history:
-                    if 'user' in turn and 'assistant' in turn:
-                        messages.extend([
-                            {"role": "user", "content": turn['user']},
-                            {"role": "assistant", "content": turn['assistant']}
-                        ])
-            
-            # Add current message
-            messages.append({"role": "user", "content": message})
+            # Build messages array (Claude format); first turns have no history
+            user_message = {"role": "user", "content": message}
+            if not history:
+                messages = [user_message]
+            else:
+                messages = self.format_conversation_history(history)
+                messages.append(user_message)
             
             # Make API call with personality prompt
             response = await self.client.messages.create(
                 model=model_to_use,
                 max_tokens=1000,
                 messages=messages,
-                system=self.get_system_prompt()
+                system=self._personality_prompt
             )
             
             return response.content[0].text
@@ -53,30 +50,27 @@ class ClaudeProvider(BaseLLMProvider):
         try:
             model_to_test = model or self.current_model or "claude-3-haiku-20240307"
             
-            response = await self.client.messages.create(
-                model=model_to_test,
-                max_tokens=10,
-                messages=[{"role": "user", "content": "Hello"}],
-                system=self.get_system_prompt()
-            )
+            # Looking up the model is free, unlike a test message; the SDK
+            # raises on an error status (bad key, unknown model)
+            response = await self.client.get(f"/v1/models/{model_to_test}", cast_to=httpx.Response)
             
-            return bool(response.content[0].text)
+            return response.status_code == 200
             
         except Exception as e:
             self.logger.error(f"Claude health check failed: {e}")
             return False
     
-    def get_available_models(self) -> List[Dict[str, Any]]:
+    def get_available_models(self) -> Tuple[Mapping[str, Any], ...]:
         """Get available Claude models"""
-        return self._models.copy()
+        return self._models
     
     def set_model(self, model: str) -> bool:
         """Set current Claude model"""
-        for model_info in self._models:
-            if model_info['id'] == model and model_info['available']:
-                self.current_model = model
-                self.logger.info(f"Claude model set to: {model}")
-                return True
+        model_info = self._models_by_id.get(model)
+        if model_info and model_info['available']:
+            self.current_model = model
+            self.logger.info(f"Claude model set to: {model}")
+            return True
         
         self.logger.warning(f"Claude model not available: {model}")
         return False
\ No newline at end of file
@@ -1,7 +1,15 @@
 import aiohttp
-import json
-from typing import List, Dict, Any, Optional
+import asyncio
+import orjson
+import time
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from .base_provider import BaseLLMProvider
+from ..core.http import get_connector
+
+def _orjson_dumps(obj: Any) -> str:
+    """Serialize request bodies with orjson instead of the stdlib json module"""
+    return orjson.dumps(obj).decode()
 
 class OllamaProvider(BaseLLMProvider):
     """Ollama local LLM provider"""
@@ -9,42 +17,63 @@ class OllamaProvider(BaseLLMProvider):
     def __init__(self, base_url: str = "http://localhost:11434"):
         super().__init__("Ollama", None)  # No API key needed for local
         self.base_url = base_url
-        self._models = []
+        self._models: Tuple[Mapping[str, Any], ...] = ()
+        self._models_fetched_at = 0.0
+        self._models_ttl = 60.0  # Seconds before the cached model list is refreshed
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            # Keep-alive connections and DNS cache come from the shared pool
+            self._session = aiohttp.ClientSession(
+                base_url=self.base_url,
+                connector=get_connector(),
+                connector_owner=False,
+                json_serialize=_orjson_dumps
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def chat(self, message: str, history: List[Dict[str, str]] = None, model: str = None) -> str:
         """Send chat message to Ollama"""
         try:
             model_to_use = model or self.current_model or "llama3.1:8b"
             
-            # Build prompt with personality and history
-            prompt = f"System: {self.get_system_prompt()}\n\n"
-            
-            if history:
-                for turn in history:
-                    if 'user' in turn and 'assistant' in turn:
-                        prompt += f"User: {turn['user']}\nAssistant: {turn['assistant']}\n"
-            
-            prompt += f"User: {message}\nAssistant:"
+            # Send structured messages so Ollama can apply the model's chat template
+            user_message = {"role": "user", "content": message}
+            if not history:
+                messages = [self._system_message, user_message]
+            else:
+                messages = [self._system_message, *self.format_conversation_history(history), user_message]
             
             # Make API call to Ollama
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": model_to_use,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.7,
-                            "top_p": 0.9
-                        }
+            session = await self._get_session()
+            async with session.post(
+                "/api/chat",
+                json={
+                    "model": model_to_use,
+                    "messages": messages,
+                    "stream": False,
+                    "options": {
+                        "temperature": 0.7,
+                        "top_p": 0.9
                     }
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get('response', '').strip()
-                    else:
-                        raise Exception(f"Ollama API error: {response.status}")
+                }
+            ) as response:
+                if response.status == 200:
+                    result = await response.json(loads=orjson.loads)
+                    return result.get('message', {}).get('content', '').strip()
+                else:
+                    raise Exception(f"Ollama API error: {response.status}")
                         
         except Exception as e:
             self.logger.error(f"Ollama chat error: {e}")
@@ -53,59 +82,72 @@ class OllamaProvider(BaseLLMProvider):
     async def health_check(self, model: str = None) -> bool:
         """Check Ollama service health"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Check if Ollama service is running
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status != 200:
-                        return False
-                
-                # Test with a model if specified
-                if model or self.current_model:
-                    test_model = model or self.current_model
-                    async with session.post(
-                        f"{self.base_url}/api/generate",
-                        json={
-                            "model": test_model,
-                            "prompt": "Hello",
-                            "stream": False,
-                            "options": {"max_tokens": 5}
-                        }
-                    ) as test_response:
-                        return test_response.status == 200
-                
-                return True
+            session = await self._get_session()
+            
+            # Listing models is cheap; a test generation would load and run the model
+            async with session.get("/api/tags") as response:
+                if response.status != 200:
+                    return False
+                data = await response.json(loads=orjson.loads)
+            
+            # Check the model is installed if one is specified
+            test_model = model or self.current_model
+            if test_model:
+                names = {entry.get('name') for entry in data.get('models', [])}
+                return test_model in names or f"{test_model}:latest" in names
+            
+            return True
                 
         except Exception as e:
             self.logger.error(f"Ollama health check failed: {e}")
             return False
     
-    def get_available_models(self) -> List[Dict[str, Any]]:
-        """Get available Ollama models (cached)"""
-        return self._models.copy()
+    def get_available_models(self) -> Tuple[Mapping[str, Any], ...]:
+        """Get available Ollama models (cached, refreshed in the background when stale)"""
+        self._revalidate_models()
+        return self._models
+    
+    def _revalidate_models(self):
+        """Start a background refresh of the model list if the cache is stale"""
+        if time.monotonic() - self._models_fetched_at < self._models_ttl:
+            return
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop to refresh on; keep serving the cache
+        self._refresh_task = loop.create_task(self._fetch_available_models())
     
-    async def _fetch_available_models(self) -> List[Dict[str, Any]]:
+    async def _fetch_available_models(self) -> Tuple[Mapping[str, Any], ...]:
         """Fetch available Ollama models from API"""
+        # Failed attempts count too, so an unreachable Ollama is retried once per TTL
+        self._models_fetched_at = time.monotonic()
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        models = []
-                        for model in data.get('models', []):
-                            models.append({
-                                "id": model['name'],
-                                "name": model['name'],
-                                "available": True,
-                                "cost_tier": "free",
-                                "size": model.get('size', 0)
-                            })
-                        self._models = models
-                        return models
-                    else:
-                        return []
+            session = await self._get_session()
+            async with session.get("/api/tags") as response:
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    models = tuple(
+                        MappingProxyType({
+                            "id": model['name'],
+                            "name": model['name'],
+                            "available": True,
+                            "cost_tier": "free",
+                            "size": model.get('size', 0)
+                        })
+                        for model in data.get('models', [])
+                    )
+                    self._models = models
+                    self._models_by_id = {model['id']: model for model in models}
+                    self.available_models = models
+                    self._models_fetched_at = time.monotonic()
+                    return models
+                else:
+                    return ()
         except Exception as e:
             self.logger.error(f"Error getting Ollama models: {e}")
-            return []
+            return ()
     
     def set_model(self, model: str) -> bool:
         """Set current Ollama model"""
@@ -1,33 +1,34 @@
 import openai
-from typing import List, Dict, Any, Optional
+import httpx
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from .base_provider import BaseLLMProvider
 
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI provider for GPT models"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
         super().__init__("OpenAI", api_key)
-        self.client = openai.AsyncOpenAI(api_key=api_key)
-        self._models = [
+        self.client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client)
+        # Read-only model table shared with callers without copying
+        self._models = tuple(MappingProxyType(model) for model in [
             {"id": "gpt-4o", "name": "GPT-4o", "available": True, "cost_tier": "high"},
             {"id": "gpt-3.5-turbo", "name": "GPT-3.5 Turbo", "available": True, "cost_tier": "low"},
             {"id": "o3-mini", "name": "o3-mini", "available": False, "cost_tier": "medium"}  # Requires special access
-        ]
+        ])
+        self._models_by_id = {model['id']: model for model in self._models}
     
     async def chat(self, message: str, history: List[Dict[str, str]] = None, model: str = None) -> str:
         """Send chat message to OpenAI"""
         try:
             model_to_use = model or self.current_model or "gpt-4o"
             
-            # Build messages array with personality prompt
-            messages = [{"role": "system", "content": self.get_system_prompt()}]
-            
-            # Add conversation history
-            if history:
-                messages.extend(self.format_conversation_history(history))
-            
-            # Add current message
-            messages.append({"role": "user", "content": message})
+            # Build messages array with personality prompt; first turns have no history
+            user_message = {"role": "user", "content": message}
+            if not history:
+                messages = [self._system_message, user_message]
+            else:
+                messages = [self._system_message, *self.format_conversation_history(history), user_message]
             
             # Make API call
             response = await self.client.chat.completions.create(
@@ -48,29 +49,26 @@ class OpenAIProvider(BaseLLMProvider):
         try:
             model_to_test = model or self.current_model or "gpt-3.5-turbo"
             
-            response = await self.client.chat.completions.create(
-                model=model_to_test,
-                messages=[{"role": "user", "content": "Hello"}],
-                max_tokens=10
-            )
+            # Looking up the model is free, unlike a test completion
+            response = await self.client.models.retrieve(model_to_test)
             
-            return bool(response.choices[0].message.content)
+            return response.id == model_to_test
             
         except Exception as e:
             self.logger.error(f"OpenAI health check failed: {e}")
             return False
     
-    def get_available_models(self) -> List[Dict[str, Any]]:
+    def get_available_models(self) -> Tuple[Mapping[str, Any], ...]:
         """Get available OpenAI models"""
-        return self._models.copy()
+        return self._models
     
     def set_model(self, model: str) -> bool:
         """Set current OpenAI model"""
-        for model_info in self._models:
-            if model_info['id'] == model and model_info['available']:
-                self.current_model = model
-                self.logger.info(f"OpenAI model set to: {model}")
-                return True
+        model_info = self._models_by_id.get(model)
+        if model_info and model_info['available']:
+            self.current_model = model
+            self.logger.info(f"OpenAI model set to: {model}")
+            return True
         
         self.logger.warning(f"OpenAI model not available: {model}")
         return False
\ No newline at end of file
@@ -1,11 +1,29 @@
 import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
+import random
+import time
+from collections import OrderedDict
+from contextlib import suppress
+import httpx
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 from ..core.config import config
 from .openai_provider import OpenAIProvider
 from .claude_provider import ClaudeProvider
 from .ollama_provider import OllamaProvider
 
+# Every provider the status endpoint reports on, in display order
+_ALL_PROVIDER_NAMES: Tuple[str, ...] = ("openai", "claude", "xai", "lm_studio", "ollama")
+
+# Shared status of a provider that is not initialized; read-only
+_PLACEHOLDER_STATUS: Mapping[str, Any] = MappingProxyType({
+    "available": False,
+    "current_model": None,
+    "model_health": False,
+    "models": ()
+})
+
 class ProviderManager:
     """Manages multiple LLM providers with automatic fallback"""
     
@@ -15,41 +33,111 @@ class ProviderManager:
         self.current_model = None
         self.logger = logging.getLogger(__name__)
         self.fallback_chain = ["openai", "claude", "ollama"]
+        self._fallback_order: Tuple[str, ...] = ()  # Initialized providers, in fallback order
+        # Primary provider -> the other initialized providers, in fallback order
+        self._fallback_index: Dict[str, Tuple[str, ...]] = {}
+        self.hedge_delay = 5.0  # Seconds to wait on a provider before also trying the next
+        # Cached provider model lists are refreshed once this old (seconds)
+        self.health_ttl = float(config.get_setting("provider_health_ttl", 60.0))
+        # All providers are re-checked in the background this often (seconds)
+        self.health_interval = float(config.get_setting("provider_health_interval", 30.0))
+        self._health_task: Optional[asyncio.Task] = None
+        # Optional LRU cache of recent replies to identical prompts
+        self.response_cache_enabled = bool(config.get_setting("response_cache_enabled", False))
+        self.response_cache_ttl = float(config.get_setting("response_cache_ttl", 60.0))
+        self.response_cache_size = int(config.get_setting("response_cache_size", 1024))
+        self._response_cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._models_cache: Dict[str, Tuple[float, tuple]] = {}  # name -> (fetched_at, models)
+        # Served as-is by get_provider_status; entries change only with provider state
+        self._status_snapshot: Dict[str, Mapping[str, Any]] = dict.fromkeys(
+            _ALL_PROVIDER_NAMES, _PLACEHOLDER_STATUS
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP/2 client shared by the SDK-based providers"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=30,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._http
     
     async def initialize(self):
-        """Initialize all available providers"""
-        # Initialize OpenAI if API key available
-        if config.has_api_key("openai"):
-            try:
-                openai_provider = OpenAIProvider(config.get_api_key("openai"))
-                await openai_provider.initialize()
-                self.providers["openai"] = openai_provider
-                self.logger.info("OpenAI provider initialized")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize OpenAI: {e}")
-        
-        # Initialize Claude if API key available
-        if config.has_api_key("claude"):
-            try:
-                claude_provider = ClaudeProvider(config.get_api_key("claude"))
-                await claude_provider.initialize()
-                self.providers["claude"] = claude_provider
-                self.logger.info("Claude provider initialized")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize Claude: {e}")
-        
-        # Initialize Ollama (local, no API key needed)
+        """Initialize all available providers concurrently"""
+        results = await asyncio.gather(
+            self._init_openai(),
+            self._init_claude(),
+            self._init_ollama(),
+            return_exceptions=True
+        )
+        
+        for result in results:
+            if isinstance(result, BaseException):
+                self.logger.error("Provider initialization failed: %s", result)
+                continue
+            name, provider = result
+            if provider is not None:
+                self.providers[name] = provider
+                # Provider initialization already ran a health check over the
+                # shared pools, which leaves a warm connection for the first chat
+                self._models_cache[name] = (time.monotonic(), tuple(provider.get_available_models()))
+                self._update_status(name)
+        
+        self._rebuild_fallback_index()
+        
+        # Set default provider and model
+        await self._set_default_provider()
+    
+    def _rebuild_fallback_index(self):
+        """Precompute the fallback providers for each possible primary provider"""
+        self._fallback_order = tuple(
+            name for name in self.fallback_chain if name in self.providers
+        )
+        self._fallback_index = {
+            primary: tuple(name for name in self._fallback_order if name != primary)
+            for primary in self._fallback_order
+        }
+    
+    async def _init_openai(self) -> Tuple[str, Optional[OpenAIProvider]]:
+        """Initialize OpenAI if API key available"""
+        if not config.has_api_key("openai"):
+            return "openai", None
+        try:
+            openai_provider = OpenAIProvider(config.get_api_key("openai"), self._get_http_client())
+            await openai_provider.initialize()
+            self.logger.info("OpenAI provider initialized")
+            return "openai", openai_provider
+        except Exception as e:
+            self.logger.error("Failed to initialize OpenAI: %s", e)
+            return "openai", None
+    
+    async def _init_claude(self) -> Tuple[str, Optional[ClaudeProvider]]:
+        """Initialize Claude if API key available"""
+        if not config.has_api_key("claude"):
+            return "claude", None
+        try:
+            claude_provider = ClaudeProvider(config.get_api_key("claude"), self._get_http_client())
+            await claude_provider.initialize()
+            self.logger.info("Claude provider initialized")
+            return "claude", claude_provider
+        except Exception as e:
+            self.logger.error("Failed to initialize Claude: %s", e)
+            return "claude", None
+    
+    async def _init_ollama(self) -> Tuple[str, Optional[OllamaProvider]]:
+        """Initialize Ollama (local, no API key needed)"""
         try:
             ollama_provider = OllamaProvider()
             await ollama_provider.initialize()
             if ollama_provider.is_healthy:
-                self.providers["ollama"] = ollama_provider
                 self.logger.info("Ollama provider initialized")
+                return "ollama", ollama_provider
+            await ollama_provider.close()
         except Exception as e:
-            self.logger.error(f"Failed to initialize Ollama: {e}")
-        
-        # Set default provider and model
-        await self._set_default_provider()
+            self.logger.error("Failed to initialize Ollama: %s", e)
+        return "ollama", None
     
     async def _set_default_provider(self):
         """Set the default provider based on availability"""
@@ -61,78 +149,156 @@ class ProviderManager:
                     if provider.is_healthy and provider.get_current_model():
                         self.current_provider = provider_name
                         self.current_model = provider.get_current_model()
-                        self.logger.info(f"Default provider set to: {provider_name} with model: {self.current_model}")
+                        self.logger.info("Default provider set to: %s with model: %s", provider_name, self.current_model)
                         return
                 else:
                     if provider.is_available():
                         self.current_provider = provider_name
                         self.current_model = provider.get_current_model()
-                        self.logger.info(f"Default provider set to: {provider_name} with model: {self.current_model}")
+                        self.logger.info("Default provider set to: %s with model: %s", provider_name, self.current_model)
                         return
         
         self.logger.warning("No providers available")
     
     async def chat(self, message: str, history: List[Dict[str, str]] = None, 
                    provider: str = None, model: str = None) -> Dict[str, Any]:
-        """Send chat message with automatic fallback"""
+        """Send chat message with automatic, hedged fallback
+        
+        Candidates are started in fallback order: the next one is launched when
+        the running attempts fail or have not answered within hedge_delay. The
+        first successful response wins and the remaining attempts are cancelled.
+        """
         provider_to_use = provider or self.current_provider
         model_to_use = model or self.current_model
         
-        # Try the specified/current provider first
+        cache_key = None
+        if self.response_cache_enabled:
+            cache_key = self._response_cache_key(provider_to_use, model_to_use, message, history)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+        
+        # The specified/current provider goes first, then the fallback chain
+        candidates = []
         if provider_to_use and provider_to_use in self.providers:
-            try:
-                response = await self._try_provider(provider_to_use, message, history, model_to_use)
-                if response:
-                    return {
-                        "text": response,
-                        "provider": provider_to_use,
-                        "model": model_to_use,
-                        "fallback_used": False
-                    }
-            except Exception as e:
-                self.logger.warning(f"Provider {provider_to_use} failed: {e}")
-        
-        # Try fallback chain
-        for fallback_provider in self.fallback_chain:
-            if (fallback_provider != provider_to_use and 
-                fallback_provider in self.providers and 
-                self.providers[fallback_provider].is_available()):
+            candidates.append((provider_to_use, model_to_use, False))
+        for fallback_provider in self._fallback_index.get(provider_to_use, self._fallback_order):
+            if self._is_available_cached(fallback_provider):
+                provider_obj = self.providers[fallback_provider]
+                candidates.append((fallback_provider, provider_obj.get_current_model(), True))
+        
+        attempts: Dict[asyncio.Future, tuple] = {}
+        pending = set()
+        next_candidate = 0
+        
+        try:
+            while True:
+                # Start the next candidate after a failure or an unanswered hedge delay;
+                # unavailable ones are skipped without creating a task
+                while next_candidate < len(candidates):
+                    candidate = candidates[next_candidate]
+                    next_candidate += 1
+                    name, candidate_model, _ = candidate
+                    provider_obj = self._resolve_provider(name)
+                    if provider_obj is None:
+                        continue
+                    task = asyncio.ensure_future(
+                        provider_obj.chat(message, history, candidate_model)
+                    )
+                    attempts[task] = candidate
+                    pending.add(task)
+                    break
                 
-                try:
-                    fallback_model = self.providers[fallback_provider].get_current_model()
-                    response = await self._try_provider(fallback_provider, message, history, fallback_model)
+                if not pending:
+                    break
+                
+                timeout = self.hedge_delay if next_candidate < len(candidates) else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                for task in done:
+                    name, candidate_model, fallback_used = attempts[task]
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        if fallback_used:
+                            self.logger.warning("Fallback provider %s failed: %s", name, e)
+                        else:
+                            self.logger.warning("Provider %s failed: %s", name, e)
+                        continue
+                    
                     if response:
-                        self.logger.info(f"Fallback successful with {fallback_provider}")
-                        return {
+                        if fallback_used:
+                            self.logger.info("Fallback successful with %s", name)
+                        result = {
                             "text": response,
-                            "provider": fallback_provider,
-                            "model": fallback_model,
-                            "fallback_used": True
+                            "provider": name,
+                            "model": candidate_model,
+                            "fallback_used": fallback_used
                         }
-                except Exception as e:
-                    self.logger.warning(f"Fallback provider {fallback_provider} failed: {e}")
+                        if cache_key is not None:
+                            self._store_response(cache_key, result)
+                        return result
+        finally:
+            # Wait for the losing attempts to finish cancelling so their
+            # requests are cleaned up and their errors are retrieved
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
         
         # All providers failed
         raise Exception("All LLM providers failed")
     
-    async def _try_provider(self, provider_name: str, message: str, 
-                          history: List[Dict[str, str]], model: str) -> Optional[str]:
-        """Try a specific provider"""
-        provider = self.providers.get(provider_name)
-        if not provider or not provider.is_available():
+    def _response_cache_key(self, provider: Optional[str], model: Optional[str],
+                            message: str, history: List[Dict[str, str]]) -> bytes:
+        """Digest of everything that determines a reply"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{provider}\0{model}\0".encode())
+        for turn in history or ():
+            # Only the conversation text counts; turn timestamps would defeat the cache
+            digest.update(f"{turn.get('user')}\0{turn.get('assistant')}\0".encode())
+        digest.update(message.encode())
+        return digest.digest()
+    
+    def _get_cached_response(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Get a cached reply if it is younger than response_cache_ttl"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= self.response_cache_ttl:
+            del self._response_cache[key]
             return None
         
-        return await provider.chat(message, history, model)
+        self._response_cache.move_to_end(key)
+        return result
+    
+    def _store_response(self, key: bytes, result: Dict[str, Any]):
+        """Cache a reply, evicting the least recently used beyond response_cache_size"""
+        self._response_cache[key] = (time.monotonic(), result)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self.response_cache_size:
+            self._response_cache.popitem(last=False)
+    
+    def _resolve_provider(self, provider_name: str):
+        """Get a provider that is ready to chat, or None"""
+        provider = self.providers.get(provider_name)
+        if not provider or not self._is_available_cached(provider_name):
+            return None
+        return provider
     
     def set_provider(self, provider_name: str, model: str = None) -> bool:
         """Set current provider and optionally model"""
         if provider_name not in self.providers:
-            self.logger.error(f"Provider {provider_name} not available")
+            self.logger.error("Provider %s not available", provider_name)
             return False
         
         provider = self.providers[provider_name]
         if not provider.is_available():
-            self.logger.error(f"Provider {provider_name} not healthy")
+            self.logger.error("Provider %s not healthy", provider_name)
             return False
         
         self.current_provider = provider_name
@@ -144,8 +310,9 @@ class ProviderManager:
                 self.current_model = provider.get_current_model()
         else:
             self.current_model = provider.get_current_model()
+        self._update_status(provider_name)
         
-        self.logger.info(f"Provider set to {provider_name} with model {self.current_model}")
+        self.logger.info("Provider set to %s with model %s", provider_name, self.current_model)
         return True
     
     def set_model(self, model: str, provider: str = None) -> bool:
@@ -153,60 +320,118 @@ class ProviderManager:
         provider_to_use = provider or self.current_provider
         
         if provider_to_use not in self.providers:
-            self.logger.error(f"Provider {provider_to_use} not available")
+            self.logger.error("Provider %s not available", provider_to_use)
             return False
         
         provider_obj = self.providers[provider_to_use]
         if provider_obj.set_model(model):
             if provider_to_use == self.current_provider:
                 self.current_model = model
-            self.logger.info(f"Model set to {model} for provider {provider_to_use}")
+            self._update_status(provider_to_use)
+            self.logger.info("Model set to %s for provider %s", model, provider_to_use)
             return True
         
         return False
     
-    def get_provider_status(self) -> Dict[str, Any]:
-        """Get status of all providers"""
-        status = {}
-        
-        for name, provider in self.providers.items():
-            status[name] = {
-                "available": provider.is_available(),
-                "current_model": provider.get_current_model(),
-                "model_health": provider.is_healthy,
-                "models": provider.get_available_models()
-            }
-        
-        # Add placeholder for providers not initialized
-        for provider_name in ["openai", "claude", "xai", "lm_studio", "ollama"]:
-            if provider_name not in status:
-                status[provider_name] = {
-                    "available": False,
-                    "current_model": None,
-                    "model_health": False,
-                    "models": []
-                }
-        
-        return status
-    
-    async def health_check_all(self):
-        """Perform health check on all providers"""
-        tasks = []
-        for name, provider in self.providers.items():
-            tasks.append(self._check_provider_health(name, provider))
-        
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+    def get_provider_status(self) -> Mapping[str, Mapping[str, Any]]:
+        """Get status of all providers as a read-only view of the snapshot"""
+        return MappingProxyType(self._status_snapshot)
+    
+    def _update_status(self, name: str):
+        """Refresh a provider's entry in the status snapshot in place"""
+        provider = self.providers.get(name)
+        if provider is None:
+            return
+        
+        entry = self._status_snapshot.get(name)
+        if not isinstance(entry, dict):
+            # Replace the shared placeholder with the provider's own entry
+            entry = self._status_snapshot[name] = {}
+        entry["available"] = provider.is_available()
+        entry["current_model"] = provider.get_current_model()
+        entry["model_health"] = provider.is_healthy
+        entry["models"] = self._cached_models(name, provider)
+    
+    async def health_check_all(self, max_concurrent: int = 8):
+        """Perform health check on all providers, a bounded number at a time"""
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def check(name: str, provider):
+            async with semaphore:
+                await self._check_provider_health(name, provider)
+        
+        # Snapshot so providers added while checks run are left alone
+        providers = tuple(self.providers.items())
+        if providers:
+            await asyncio.gather(
+                *(check(name, provider) for name, provider in providers),
+                return_exceptions=True
+            )
+    
+    def start_health_checks(self):
+        """Start the background task that periodically health-checks all providers"""
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.create_task(self._health_check_loop())
+    
+    async def _health_check_loop(self):
+        """Health-check all providers every health_interval seconds"""
+        while True:
+            # Jitter keeps replicas from probing the providers in lockstep
+            await asyncio.sleep(self.health_interval * random.uniform(0.9, 1.1))
+            # Not shielded: close() must stop a running round before the
+            # HTTP clients and sessions it uses are closed
+            await self.health_check_all()
     
     async def _check_provider_health(self, name: str, provider):
         """Check health of a single provider"""
         try:
             is_healthy = await provider.health_check()
             provider.is_healthy = is_healthy
-            self.logger.info(f"Provider {name} health check: {'✓' if is_healthy else '✗'}")
+            if is_healthy:
+                self._models_cache[name] = (time.monotonic(), tuple(provider.get_available_models()))
+            self.logger.info("Provider %s health check: %s", name, '✓' if is_healthy else '✗')
         except Exception as e:
             provider.is_healthy = False
-            self.logger.error(f"Provider {name} health check failed: {e}")
+            self.logger.error("Provider %s health check failed: %s", name, e)
+        finally:
+            self._update_status(name)
+    
+    def _cached_models(self, name: str, provider) -> tuple:
+        """Get a provider's model list, refreshed by health checks or once older than health_ttl"""
+        cached = self._models_cache.get(name)
+        if cached is not None and time.monotonic() - cached[0] < self.health_ttl:
+            return cached[1]
+        
+        models = tuple(provider.get_available_models())
+        self._models_cache[name] = (time.monotonic(), models)
+        return models
+    
+    def _is_available_cached(self, name: str) -> bool:
+        """Report provider availability from its last health check
+        
+        Never probes inline; results are kept fresh by the background health
+        check loop started with start_health_checks.
+        """
+        provider = self.providers.get(name)
+        if provider is None:
+            return False
+        return provider.is_available()
+    
+    async def close(self):
+        """Release resources held by all providers"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._health_task
+            self._health_task = None
+        
+        await asyncio.gather(
+            *(provider.close() for provider in self.providers.values()),
+            return_exceptions=True
+        )
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
 # Global provider manager instance
 provider_manager = ProviderManager()
\ No newline at end of file
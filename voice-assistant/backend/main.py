@@ -1,45 +1,59 @@
-from fastapi import FastAPI, WebSocket, HTTPException
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, WebSocket, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
+import asyncio
 import logging
+import os
+import orjson
 from pathlib import Path
 
 from .core.config import config
 from .core.session_manager import session_manager
+from .core.http import close_connector
 from .api.websocket_handler import websocket_handler
+from .api.static_assets import StaticAssets
 from .llm.provider_manager import provider_manager
-from .monitoring.self_awareness import self_awareness_monitor
+from .monitoring.self_awareness import get_self_awareness_monitor
 from .audio.speech_processor import speech_processor
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Self-Aware Voice Assistant",
     description="Voice-activated AI assistant with self-awareness monitoring",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured when the config module is imported
 logger = logging.getLogger(__name__)
 
-# Mount static files
+# Index static files once; directories match the frontend URL structure
 frontend_path = Path(__file__).parent.parent / "frontend"
+static_assets = StaticAssets(frontend_path)
 if frontend_path.exists():
-    # Mount individual directories to match frontend URL structure
-    app.mount("/assets", StaticFiles(directory=str(frontend_path / "assets")), name="assets")
-    app.mount("/components", StaticFiles(directory=str(frontend_path / "components")), name="components")
-    app.mount("/services", StaticFiles(directory=str(frontend_path / "services")), name="services")
+    static_assets.load("assets", "components", "services")
+    if (frontend_path / "index.html").is_file():
+        static_assets.add(frontend_path / "index.html")
 
 @app.get("/")
-async def read_root():
+async def read_root(request: Request):
     """Serve the main frontend page"""
-    frontend_file = frontend_path / "index.html"
-    if frontend_file.exists():
-        return FileResponse(frontend_file)
+    response = static_assets.response("index.html", request.headers.get("if-none-match"))
+    if response is not None:
+        return response
     return {"message": "Self-Aware Voice Assistant API", "status": "running"}
 
-@app.get("/health")
+@app.get("/assets/{file_path:path}")
+@app.get("/components/{file_path:path}")
+@app.get("/services/{file_path:path}")
+async def read_static(request: Request, file_path: str):
+    """Serve an indexed frontend asset"""
+    response = static_assets.response(request.url.path.lstrip("/"), request.headers.get("if-none-match"))
+    if response is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return response
+
+@app.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint"""
     from datetime import datetime
@@ -78,38 +92,76 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """WebSocket endpoint for real-time communication"""
     await websocket_handler.handle_connection(websocket, session_id)
 
-@app.get("/providers/status")
+@app.get("/providers/status", response_class=ORJSONResponse)
 async def get_provider_status():
     """Get status of all LLM providers"""
-    return {
-        "providers": provider_manager.get_provider_status()
-    }
+    # Encode directly, skipping FastAPI's jsonable_encoder pass; model
+    # entries are read-only mappings, which orjson serializes via dict()
+    content = orjson.dumps(
+        {"providers": provider_manager.get_provider_status()},
+        default=dict
+    )
+    return Response(content=content, media_type="application/json")
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize all components on startup"""
     logger.info("Initializing Self-Aware Voice Assistant components...")
     
-    # Initialize LLM provider manager
-    await provider_manager.initialize()
+    # Start tasks eagerly so coroutines that finish without blocking
+    # never go through the scheduler (Python 3.12+)
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
     
-    # Initialize self-awareness monitor
-    if await self_awareness_monitor.initialize():
-        # Start monitoring in background
-        import asyncio
-        asyncio.create_task(self_awareness_monitor.start_monitoring())
+    # Start expiring idle sessions
+    await session_manager.start()
+    
+    self_awareness_monitor = get_self_awareness_monitor()
     
-    # Initialize speech processor
-    await speech_processor.initialize()
+    # Initialize LLM providers, self-awareness monitor and speech processor
+    # concurrently; they do not depend on each other
+    _, monitor_ready, _ = await asyncio.gather(
+        provider_manager.initialize(),
+        self_awareness_monitor.initialize(),
+        speech_processor.initialize()
+    )
+    
+    # Keep provider health fresh so requests only read cached results
+    provider_manager.start_health_checks()
+    
+    if monitor_ready:
+        # Start monitoring in background
+        self_awareness_monitor.start_monitoring_task()
     
     logger.info("All components initialized successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release resources held by components on shutdown"""
+    await session_manager.stop()
+    await get_self_awareness_monitor().shutdown()
+    await speech_processor.cleanup()
+    await provider_manager.close()
+    await close_connector()
+
 if __name__ == "__main__":
     logger.info("Starting Self-Aware Voice Assistant")
+    # Auto-reload is for development only (set DEV=1)
+    dev_mode = bool(os.getenv("DEV"))
     uvicorn.run(
         "backend.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        reload=dev_mode,
+        # Sessions and provider state live in this process, so a single worker
+        workers=1,
+        log_level="info",
+        access_log=False,  # Skip a synchronous log write per request
+        # Pin the fast C implementations shipped with uvicorn[standard]
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        # Large messages are compressed once in the handler instead
+        ws_per_message_deflate=False
     )
\ No newline at end of file
@@ -1,14 +1,46 @@
 import asyncio
-import json
 import logging
+import operator
+import os
 import time
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from pathlib import Path
+from typing import Dict, List, Any, Optional, Set
 import re
+import threading
+import orjson
 
 from ..llm.ollama_provider import OllamaProvider
 
+# Compiled once; used for every scanned log line. The timestamp is fixed-width
+# and zero-padded, so timestamps compare correctly as strings
+_LOG_TS_RE = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+_LOG_TS_LENGTH = 19
+
+# The log is tailed incrementally, keeping its last lines parsed; a newly
+# opened (or rotated) log is first read from this many bytes before its end
+_LOG_TAIL_LINES = 100
+_LOG_INITIAL_READ_BYTES = 64 * 1024
+
+# Capability keywords, matched anywhere in a lowercased question ('websites' counts as 'web')
+_WEB_KEYWORDS_RE = re.compile('browse|web|internet|search')
+_IMAGE_KEYWORDS_RE = re.compile('image|picture|generate|create')
+_AUDIO_KEYWORDS_RE = re.compile('hear|audio|voice|speak')
+
+# Capability answers are cached per normalized question and system status
+_CAPABILITY_CACHE_SIZE = 256
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+_LLM_MAX_CONCURRENT = 4  # Local LLM requests in flight at once
+_LLM_TIMEOUT = 30.0  # Seconds before a single prompt is abandoned
+
+# (metric, default, comparison, threshold, recommendation), checked in order
+_RECOMMENDATION_RULES = (
+    ('stt_confidence', 100, operator.lt, 80, "Check microphone position and reduce background noise"),
+    ('llm_response_time', 0, operator.gt, 3, "Consider switching to faster LLM model"),
+    ('error_count', 0, operator.gt, 2, "Review recent error logs for issues")
+)
+
 class SelfAwarenessMonitor:
     """Self-aware system monitor using local LLM for consciousness and analysis"""
     
@@ -19,7 +51,21 @@ class SelfAwarenessMonitor:
         self.system_metrics = {}
         self.error_patterns = []
         self.capability_knowledge = self._initialize_capability_knowledge()
+        self._capability_prompt_prefix = self._build_capability_prompt_prefix()
+        self._capability_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        # Incremental log tail: read position, file identity, and parsed lines
+        self._log_offset = 0
+        self._log_inode: Optional[int] = None
+        self._log_partial = b''  # Trailing line not yet terminated by a newline
+        self._log_tail: "deque[str]" = deque(maxlen=_LOG_TAIL_LINES)  # Timestamped lines only
+        self._log_lock = threading.Lock()  # Reads run in worker threads
+        self._last_analyzed_logs: Optional[int] = None  # Hash of the lines last sent for analysis
         self.is_monitoring = False
+        self._start_time = time.monotonic()
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        self._llm_tasks: Set[asyncio.Task] = set()  # Local LLM calls in flight
+        self._llm_pending: Set[asyncio.Future] = set()  # Futures of submitted, unanswered prompts
+        self._monitor_task: Optional[asyncio.Task] = None
         self.alert_threshold = {
             'error_count': 5,
             'response_time': 5.0,
@@ -54,10 +100,27 @@ class SelfAwarenessMonitor:
             ]
         }
     
+    def _build_capability_prompt_prefix(self) -> str:
+        """Render the static part of the capability prompt from the knowledge base"""
+        knowledge = self.capability_knowledge
+        return f"""
+You are a self-aware AI assistant answering questions about your own capabilities. 
+
+System Knowledge:
+- Audio: {', '.join(knowledge['audio_processing']['capabilities'])}
+- Language: {', '.join(knowledge['language_processing']['capabilities'])}
+- Voice: {', '.join(knowledge['voice_synthesis']['capabilities'])}
+- Monitoring: {', '.join(knowledge['system_monitoring']['capabilities'])}
+
+Limitations:
+{', '.join(knowledge['general_limitations'])}
+"""
+    
     async def initialize(self):
         """Initialize the self-awareness monitor with local LLM"""
         try:
-            # Initialize local LLM (Ollama) for self-awareness
+            # Initialize local LLM (Ollama) for self-awareness; it keeps one
+            # pooled HTTP session for every call until shutdown() closes it
             self.local_llm = OllamaProvider()
             await self.local_llm.initialize()
             
@@ -71,6 +134,9 @@ class SelfAwarenessMonitor:
                 if self.local_llm.set_model(model):
                     break
             
+            # Bounds local LLM calls from the monitoring loop and user queries
+            self._llm_semaphore = asyncio.Semaphore(_LLM_MAX_CONCURRENT)
+            
             self.logger.info(f"Self-awareness monitor initialized with model: {self.local_llm.get_current_model()}")
             return True
             
@@ -87,85 +153,184 @@ class SelfAwarenessMonitor:
         self.is_monitoring = True
         self.logger.info("Self-awareness monitoring started")
         
-        # Start monitoring tasks
-        monitoring_tasks = [
-            self._continuous_log_analysis(),
-            self._periodic_health_assessment(),
-            self._performance_tracking()
-        ]
-        
-        await asyncio.gather(*monitoring_tasks, return_exceptions=True)
+        await self._monitor_loop()
+    
+    def start_monitoring_task(self):
+        """Start continuous monitoring in a background task that shutdown() stops"""
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self.start_monitoring())
     
     def stop_monitoring(self):
         """Stop system monitoring"""
         self.is_monitoring = False
         self.logger.info("Self-awareness monitoring stopped")
     
-    async def _continuous_log_analysis(self):
-        """Continuously analyze log files for patterns and issues"""
-        while self.is_monitoring:
-            try:
-                recent_logs = self._get_recent_logs(minutes=5)
-                if recent_logs:
-                    await self._analyze_logs_with_llm(recent_logs)
-                await asyncio.sleep(30)  # Check every 30 seconds
-            except Exception as e:
-                self.logger.error(f"Error in log analysis: {e}")
-                await asyncio.sleep(60)
+    async def shutdown(self):
+        """Stop monitoring and release the local LLM and its HTTP session"""
+        if self.is_monitoring:
+            self.stop_monitoring()
+        
+        # Stop everything that could still call the local LLM before closing it
+        tasks = [task for task in (self._monitor_task,) if task is not None]
+        tasks.extend(self._llm_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._monitor_task = None
+        self._llm_semaphore = None
+        
+        # Prompts waiting for a slot or cut off mid-call fail instead of waiting forever
+        for future in tuple(self._llm_pending):
+            if not future.done():
+                future.set_exception(RuntimeError("Self-awareness monitor shut down"))
+        self._llm_pending.clear()
+        
+        if self.local_llm is not None:
+            await self.local_llm.close()
     
-    async def _periodic_health_assessment(self):
-        """Perform periodic comprehensive health assessment"""
-        while self.is_monitoring:
-            try:
-                await self._perform_health_assessment()
-                await asyncio.sleep(300)  # Check every 5 minutes
-            except Exception as e:
-                self.logger.error(f"Error in health assessment: {e}")
-                await asyncio.sleep(300)
+    async def _submit_llm(self, prompt: str) -> str:
+        """Send a prompt to the local LLM in its own task and wait for the reply"""
+        if self._llm_semaphore is None:
+            return await self.local_llm.chat(prompt)
+        
+        # The reply comes back through a future so shutdown() can fail it
+        future = asyncio.get_running_loop().create_future()
+        self._llm_pending.add(future)
+        future.add_done_callback(self._llm_pending.discard)
+        task = asyncio.create_task(self._answer_prompt(prompt, future))
+        self._llm_tasks.add(task)
+        task.add_done_callback(self._llm_tasks.discard)
+        try:
+            return await future
+        finally:
+            # Stop the call if the caller gave up before the reply
+            task.cancel()
     
-    async def _performance_tracking(self):
-        """Track system performance metrics"""
+    async def _answer_prompt(self, prompt: str, future: asyncio.Future):
+        """Send one prompt to the local LLM and resolve its caller's future"""
+        try:
+            async with self._llm_semaphore:
+                if future.done():
+                    return
+                reply = await asyncio.wait_for(self.local_llm.chat(prompt), timeout=_LLM_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Callers see the error and fall back as for any other LLM failure
+            self.logger.warning(f"Local LLM did not answer a prompt within {_LLM_TIMEOUT}s")
+            if not future.done():
+                future.set_exception(asyncio.TimeoutError(f"Local LLM timed out after {_LLM_TIMEOUT}s"))
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(reply)
+    
+    async def _monitor_loop(self):
+        """Run each monitoring step from a single loop whenever it is due"""
+        # (description, step, period, delay after a failure) with times in seconds
+        schedule = (
+            ("log analysis", self._analyze_recent_logs, 30, 60),
+            ("health assessment", self._perform_health_assessment, 300, 300),
+            ("performance tracking", self._update_performance_metrics, 10, 30)
+        )
+        next_run = [time.monotonic()] * len(schedule)
+        
         while self.is_monitoring:
-            try:
-                self._update_performance_metrics()
-                await asyncio.sleep(10)  # Update every 10 seconds
-            except Exception as e:
-                self.logger.error(f"Error in performance tracking: {e}")
-                await asyncio.sleep(30)
+            for index, (description, step, period, retry_delay) in enumerate(schedule):
+                if time.monotonic() < next_run[index]:
+                    continue
+                try:
+                    result = step()
+                    if asyncio.iscoroutine(result):
+                        await result
+                    next_run[index] = time.monotonic() + period
+                except Exception as e:
+                    self.logger.error(f"Error in {description}: {e}")
+                    next_run[index] = time.monotonic() + retry_delay
+            
+            await asyncio.sleep(max(0.0, min(next_run) - time.monotonic()))
+    
+    async def _analyze_recent_logs(self):
+        """Analyze the last five minutes of logs for patterns and issues"""
+        # File reads run in a worker thread so the event loop keeps serving requests
+        recent_logs = await asyncio.to_thread(self._get_recent_logs, 5)
+        if not recent_logs:
+            return
+        
+        # The LLM only sees the last 20 entries; skip it when those are unchanged
+        logs_key = hash(tuple(recent_logs[-20:]))
+        if logs_key == self._last_analyzed_logs:
+            return
+        
+        # Failed analyses are retried on the next round
+        if await self._analyze_logs_with_llm(recent_logs):
+            self._last_analyzed_logs = logs_key
     
     def _get_recent_logs(self, minutes: int = 10) -> List[str]:
         """Get recent log entries"""
         try:
-            if not Path(self.log_file_path).exists():
-                return []
-            
             cutoff_time = datetime.now() - timedelta(minutes=minutes)
+            # Compared against each line's timestamp prefix; no datetime per line
+            cutoff_prefix = cutoff_time.isoformat(sep=' ', timespec='seconds')
             recent_logs = []
             
-            with open(self.log_file_path, 'r') as f:
-                lines = f.readlines()
-                for line in lines[-100:]:  # Check last 100 lines
-                    # Parse timestamp from log line
-                    timestamp_match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
-                    if timestamp_match:
-                        try:
-                            log_time = datetime.strptime(timestamp_match.group(1), '%Y-%m-%d %H:%M:%S')
-                            if log_time >= cutoff_time:
-                                recent_logs.append(line.strip())
-                        except ValueError:
-                            continue
+            with self._log_lock:
+                self._read_new_log_lines()
+                # The log is chronological, so the first entry older than the
+                # cutoff (walking newest first) ends the scan
+                for line in reversed(self._log_tail):
+                    if line[:_LOG_TS_LENGTH] < cutoff_prefix:
+                        break
+                    recent_logs.append(line)
             
+            recent_logs.reverse()
             return recent_logs
             
         except Exception as e:
             self.logger.error(f"Error reading logs: {e}")
             return []
     
-    async def _analyze_logs_with_llm(self, logs: List[str]):
-        """Analyze logs using local LLM for intelligent insights"""
+    def _read_new_log_lines(self):
+        """Parse lines appended to the log since the last read into the tail"""
+        try:
+            stat_result = os.stat(self.log_file_path)
+        except FileNotFoundError:
+            return
+        
+        skip_partial_line = False
+        if stat_result.st_ino != self._log_inode or stat_result.st_size < self._log_offset:
+            # New, rotated or truncated log: start over near its end
+            self._log_inode = stat_result.st_ino
+            self._log_offset = max(0, stat_result.st_size - _LOG_INITIAL_READ_BYTES)
+            self._log_partial = b''
+            self._log_tail.clear()
+            skip_partial_line = self._log_offset > 0
+        
+        if stat_result.st_size == self._log_offset:
+            return
+        
+        with open(self.log_file_path, 'rb') as f:
+            f.seek(self._log_offset)
+            data = f.read()
+            self._log_offset = f.tell()
+        
+        lines = (self._log_partial + data).split(b'\n')
+        self._log_partial = lines.pop()
+        if skip_partial_line and lines:
+            # Reading started mid-line
+            lines = lines[1:]
+        
+        for raw_line in lines[-_LOG_TAIL_LINES:]:
+            line = raw_line.decode('utf-8', errors='replace')
+            # Keep only lines that start with a timestamp
+            if _LOG_TS_RE.match(line):
+                self._log_tail.append(line.strip())
+    
+    async def _analyze_logs_with_llm(self, logs: List[str]) -> bool:
+        """Analyze logs using local LLM for intelligent insights; returns whether it succeeded"""
         try:
             if not logs or not self.local_llm:
-                return
+                return False
             
             # Prepare logs for analysis
             log_text = "\n".join(logs[-20:])  # Analyze last 20 log entries
@@ -187,23 +352,29 @@ Provide analysis in JSON format:
 Focus on: errors, performance issues, connection problems, API failures.
 """
             
-            response = await self.local_llm.chat(analysis_prompt)
+            response = await self._submit_llm(analysis_prompt)
             analysis = self._parse_llm_analysis(response)
             
-            if analysis and analysis.get('severity') in ['medium', 'high']:
+            if analysis is None:
+                return False
+            
+            if analysis.get('severity') in ['medium', 'high']:
                 await self._generate_proactive_alert(analysis)
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error in LLM log analysis: {e}")
+            return False
     
     def _parse_llm_analysis(self, response: str) -> Optional[Dict[str, Any]]:
         """Parse LLM analysis response"""
         try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return None
+            # Extract JSON from response: first '{' through last '}'
+            start = response.find('{')
+            end = response.rfind('}')
+            if start < 0 or end <= start:
+                return None
+            return orjson.loads(response[start:end + 1])
         except Exception as e:
             self.logger.error(f"Error parsing LLM analysis: {e}")
             return None
@@ -229,20 +400,17 @@ Focus on: errors, performance issues, connection problems, API failures.
             if not self.local_llm:
                 return self._fallback_capability_response(question)
             
+            status = self.system_metrics.get('status', 'unknown')
+            # Lowercase, drop punctuation and collapse whitespace
+            cache_key = (' '.join(_PUNCTUATION_RE.sub('', question.lower()).split()), status)
+            cached = self._capability_cache.get(cache_key)
+            if cached is not None:
+                self._capability_cache.move_to_end(cache_key)
+                return dict(cached)
+            
             # Build context-aware prompt
-            capability_prompt = f"""
-You are a self-aware AI assistant answering questions about your own capabilities. 
-
-System Knowledge:
-- Audio: {', '.join(self.capability_knowledge['audio_processing']['capabilities'])}
-- Language: {', '.join(self.capability_knowledge['language_processing']['capabilities'])}
-- Voice: {', '.join(self.capability_knowledge['voice_synthesis']['capabilities'])}
-- Monitoring: {', '.join(self.capability_knowledge['system_monitoring']['capabilities'])}
-
-Limitations:
-{', '.join(self.capability_knowledge['general_limitations'])}
-
-Current system status: {self.system_metrics.get('status', 'unknown')}
+            capability_prompt = f"""{self._capability_prompt_prefix}
+Current system status: {status}
 
 User Question: "{question}"
 
@@ -250,15 +418,20 @@ Provide a direct, honest answer about capabilities. Be specific about what you C
 Answer format: Clear explanation in 1-2 sentences.
 """
             
-            response = await self.local_llm.chat(capability_prompt)
+            response = await self._submit_llm(capability_prompt)
             
-            return {
+            result = {
                 'answer': response,
                 'capability_assessment': self._assess_capability_from_question(question),
                 'confidence': 90,
                 'source': 'self_awareness_llm'
             }
             
+            self._capability_cache[cache_key] = result
+            if len(self._capability_cache) > _CAPABILITY_CACHE_SIZE:
+                self._capability_cache.popitem(last=False)
+            return dict(result)
+            
         except Exception as e:
             self.logger.error(f"Error in capability query: {e}")
             return self._fallback_capability_response(question)
@@ -267,19 +440,19 @@ Answer format: Clear explanation in 1-2 sentences.
         """Assess capability based on question content"""
         question_lower = question.lower()
         
-        if any(term in question_lower for term in ['browse', 'web', 'internet', 'search']):
+        if _WEB_KEYWORDS_RE.search(question_lower):
             return {
                 'capability': 'internet_browsing',
                 'available': False,
                 'explanation': 'No internet browsing or real-time web access available'
             }
-        elif any(term in question_lower for term in ['image', 'picture', 'generate', 'create']):
+        elif _IMAGE_KEYWORDS_RE.search(question_lower):
             return {
                 'capability': 'image_generation',
                 'available': False,
                 'explanation': 'No image generation capabilities'
             }
-        elif any(term in question_lower for term in ['hear', 'audio', 'voice', 'speak']):
+        elif _AUDIO_KEYWORDS_RE.search(question_lower):
             return {
                 'capability': 'audio_processing',
                 'available': True,
@@ -320,7 +493,7 @@ Answer format: Clear explanation in 1-2 sentences.
             
             # Get recent performance data
             if query_type == "recent_performance":
-                recent_logs = self._get_recent_logs(timeframe_minutes)
+                recent_logs = await asyncio.to_thread(self._get_recent_logs, timeframe_minutes)
                 analysis = await self._analyze_system_performance(recent_logs, current_metrics)
             else:
                 analysis = "System status check completed"
@@ -347,6 +520,7 @@ Answer format: Clear explanation in 1-2 sentences.
     
     def _get_current_metrics(self) -> Dict[str, Any]:
         """Get current system metrics"""
+        last_update_ts = self.system_metrics.get('last_update_ts')
         return {
             'audio_input_level': self.system_metrics.get('audio_level', -20.0),
             'stt_confidence': self.system_metrics.get('stt_confidence', 85.0),
@@ -355,7 +529,8 @@ Answer format: Clear explanation in 1-2 sentences.
             'error_count': self.system_metrics.get('error_count', 0),
             'session_duration': self.system_metrics.get('session_duration', 0),
             'provider_health': self.system_metrics.get('provider_health', True),
-            'monitoring_active': self.is_monitoring
+            'monitoring_active': self.is_monitoring,
+            'last_update': datetime.fromtimestamp(last_update_ts).isoformat() if last_update_ts else None
         }
     
     def _determine_overall_status(self, metrics: Dict[str, Any]) -> str:
@@ -370,21 +545,11 @@ Answer format: Clear explanation in 1-2 sentences.
     
     def _generate_recommendations(self, metrics: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on metrics"""
-        recommendations = []
-        
-        if metrics.get('stt_confidence', 100) < 80:
-            recommendations.append("Check microphone position and reduce background noise")
-        
-        if metrics.get('llm_response_time', 0) > 3:
-            recommendations.append("Consider switching to faster LLM model")
-        
-        if metrics.get('error_count', 0) > 2:
-            recommendations.append("Review recent error logs for issues")
-        
-        if not recommendations:
-            recommendations.append("System operating optimally")
-        
-        return recommendations
+        recommendations = [
+            message for key, default, compare, threshold, message in _RECOMMENDATION_RULES
+            if compare(metrics.get(key, default), threshold)
+        ]
+        return recommendations or ["System operating optimally"]
     
     def _get_active_alerts(self) -> List[Dict[str, Any]]:
         """Get currently active alerts"""
@@ -395,8 +560,8 @@ Answer format: Clear explanation in 1-2 sentences.
         """Update real-time performance metrics"""
         # TODO: Implement actual metric collection from system components
         self.system_metrics.update({
-            'last_update': datetime.now().isoformat(),
-            'session_duration': getattr(self, '_start_time', time.time()) - time.time()
+            'last_update_ts': time.time(),  # Formatted only when reported
+            'session_duration': time.monotonic() - self._start_time
         })
     
     async def _perform_health_assessment(self):
@@ -405,7 +570,7 @@ Answer format: Clear explanation in 1-2 sentences.
             if not self.local_llm:
                 return
             
-            recent_logs = self._get_recent_logs(15)
+            recent_logs = await asyncio.to_thread(self._get_recent_logs, 15)
             metrics = self._get_current_metrics()
             
             health_prompt = f"""
@@ -423,7 +588,7 @@ Assess: Is the system healthy? Any concerning patterns? Proactive recommendation
 Response format: Brief assessment in 1-2 sentences.
 """
             
-            assessment = await self.local_llm.chat(health_prompt)
+            assessment = await self._submit_llm(health_prompt)
             self.logger.info(f"Health assessment: {assessment}")
             
         except Exception as e:
@@ -438,19 +603,33 @@ Response format: Brief assessment in 1-2 sentences.
             performance_prompt = f"""
 Analyze system performance based on:
 
-Metrics: {json.dumps(metrics, indent=2)}
+Metrics: {orjson.dumps(metrics, option=orjson.OPT_INDENT_2).decode()}
 Recent logs: {logs[-10:] if logs else 'None'}
 
 Provide brief performance analysis focusing on: responsiveness, reliability, issues detected.
 Keep response under 100 words.
 """
             
-            analysis = await self.local_llm.chat(performance_prompt)
+            analysis = await self._submit_llm(performance_prompt)
             return analysis
             
         except Exception as e:
             self.logger.error(f"Error in performance analysis: {e}")
             return "Performance analysis failed"
 
-# Global self-awareness monitor instance
-self_awareness_monitor = SelfAwarenessMonitor()
\ No newline at end of file
+# Global self-awareness monitor instance, created on first use so importing
+# this module stays cheap
+_singleton: Optional[SelfAwarenessMonitor] = None
+
+def get_self_awareness_monitor() -> SelfAwarenessMonitor:
+    """Return the global self-awareness monitor, creating it on first call"""
+    global _singleton
+    if _singleton is None:
+        _singleton = SelfAwarenessMonitor()
+    return _singleton
+
+def __getattr__(name: str):
+    # Keep `from ... import self_awareness_monitor` working
+    if name == "self_awareness_monitor":
+        return get_self_awareness_monitor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
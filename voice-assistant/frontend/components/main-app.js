@@ -10,6 +10,11 @@ class MainApp {
         this.currentResponse = null;
         this.responseStartTime = null;
         
+        // Streamed TTS playback state
+        this.playbackContext = null;
+        this.playbackTime = 0;
+        this.audioStream = null;
+        
         this.initializeElements();
         this.setupEventListeners();
         this.initialize();
@@ -42,7 +47,9 @@ class MainApp {
         // WebSocket events
         window.addEventListener('connectionEstablished', this.handleConnectionEstablished.bind(this));
         window.addEventListener('response', this.handleResponse.bind(this));
-        window.addEventListener('audioResponse', this.handleAudioResponse.bind(this));
+        window.addEventListener('audioStreamStart', this.handleAudioStreamStart.bind(this));
+        window.addEventListener('audioStreamChunk', this.handleAudioStreamChunk.bind(this));
+        window.addEventListener('audioStreamEnd', this.handleAudioStreamEnd.bind(this));
         window.addEventListener('serverError', this.handleServerError.bind(this));
         
         // Global error handling
@@ -86,8 +93,8 @@ class MainApp {
         this.displayResponse(data, responseTime);
         this.currentResponse = data;
         
-        // TTS is now automatically generated by the backend and sent as audio_response
-        // No need to request it here - just wait for the audio_response event
+        // TTS is now automatically generated by the backend and streamed as audio_stream_* messages
+        // No need to request it here - just wait for the audio stream events
         
         // Update self-awareness monitor
         if (window.selfAwarenessUI) {
@@ -95,31 +102,104 @@ class MainApp {
         }
     }
     
-    handleAudioResponse(event) {
+    handleAudioStreamStart(event) {
         const data = event.detail;
-        console.log('App: Audio response received');
+        console.log('App: Audio stream started');
         
-        if (data.audio_data && this.responseAudio) {
-            // Convert base64 to blob and create URL
-            const audioBlob = this.base64ToBlob(data.audio_data, 'audio/wav');
-            const audioUrl = URL.createObjectURL(audioBlob);
-            
-            this.responseAudio.src = audioUrl;
-            this.playResponseButton.disabled = false;
-            
-            // Auto-play the audio response
-            this.responseAudio.play().then(() => {
-                console.log('Audio response playing automatically');
-                if (window.selfAwarenessUI) {
-                    window.selfAwarenessUI.logAlert('🔊 Playing audio response', 'success');
-                }
-            }).catch(error => {
-                console.error('Auto-play failed:', error);
-                if (window.selfAwarenessUI) {
-                    window.selfAwarenessUI.logAlert('Audio ready - click play button (auto-play blocked)', 'warning');
-                }
+        this.audioStream = {
+            sampleRate: data.sample_rate,
+            channels: data.channels,
+            chunks: []
+        };
+        
+        // Chunks are scheduled back to back on an AudioContext as they arrive
+        if (!this.playbackContext) {
+            this.playbackContext = new (window.AudioContext || window.webkitAudioContext)();
+        }
+        if (this.playbackContext.state === 'suspended') {
+            this.playbackContext.resume().catch(error => {
+                console.error('Audio context resume failed:', error);
             });
         }
+        this.playbackTime = this.playbackContext.currentTime;
+    }
+    
+    handleAudioStreamChunk(event) {
+        if (!this.audioStream) {
+            return;
+        }
+        
+        const chunk = event.detail;
+        const { sampleRate, channels } = this.audioStream;
+        this.audioStream.chunks.push(chunk);
+        
+        // Deinterleave s16le PCM into float channel data
+        const samples = new Int16Array(chunk);
+        const frameCount = samples.length / channels;
+        const buffer = this.playbackContext.createBuffer(channels, frameCount, sampleRate);
+        
+        for (let channel = 0; channel < channels; channel++) {
+            const channelData = buffer.getChannelData(channel);
+            for (let i = 0; i < frameCount; i++) {
+                channelData[i] = samples[i * channels + channel] / 32768;
+            }
+        }
+        
+        const source = this.playbackContext.createBufferSource();
+        source.buffer = buffer;
+        source.connect(this.playbackContext.destination);
+        
+        const startAt = Math.max(this.playbackTime, this.playbackContext.currentTime);
+        source.start(startAt);
+        this.playbackTime = startAt + buffer.duration;
+    }
+    
+    handleAudioStreamEnd(event) {
+        const data = event.detail;
+        const stream = this.audioStream;
+        this.audioStream = null;
+        
+        if (data.error) {
+            console.error('Audio stream error:', data.error);
+        }
+        
+        if (!stream || stream.chunks.length === 0 || !this.responseAudio) {
+            return;
+        }
+        
+        // Keep the complete response as WAV for the replay button
+        const audioBlob = this.pcmToWavBlob(stream.chunks, stream.sampleRate, stream.channels);
+        if (this.responseAudio.src.startsWith('blob:')) {
+            URL.revokeObjectURL(this.responseAudio.src);
+        }
+        this.responseAudio.src = URL.createObjectURL(audioBlob);
+        this.playResponseButton.disabled = false;
+        
+        if (this.playbackContext && this.playbackContext.state === 'running') {
+            console.log('Audio response playing automatically');
+            if (window.selfAwarenessUI) {
+                window.selfAwarenessUI.logAlert('🔊 Playing audio response', 'success');
+            }
+            return;
+        }
+        
+        // Streaming playback was blocked; drop it and try the audio element
+        if (this.playbackContext) {
+            this.playbackContext.close();
+            this.playbackContext = null;
+        }
+        
+        this.responseAudio.play().then(() => {
+            console.log('Audio response playing automatically');
+            if (window.selfAwarenessUI) {
+                window.selfAwarenessUI.logAlert('🔊 Playing audio response', 'success');
+            }
+        }).catch(error => {
+            console.error('Auto-play failed:', error);
+            if (window.selfAwarenessUI) {
+                window.selfAwarenessUI.logAlert('Audio ready - click play button (auto-play blocked)', 'warning');
+            }
+        });
     }
     
     displayResponse(data, responseTime = 0) {
@@ -338,16 +418,31 @@ class MainApp {
         }, 5000);
     }
     
-    base64ToBlob(base64, mimeType) {
-        const byteCharacters = atob(base64);
-        const byteNumbers = new Array(byteCharacters.length);
+    pcmToWavBlob(chunks, sampleRate, channels) {
+        const dataLength = chunks.reduce((total, chunk) => total + chunk.byteLength, 0);
+        const header = new ArrayBuffer(44);
+        const view = new DataView(header);
+        const writeString = (offset, value) => {
+            for (let i = 0; i < value.length; i++) {
+                view.setUint8(offset + i, value.charCodeAt(i));
+            }
+        };
         
-        for (let i = 0; i < byteCharacters.length; i++) {
-            byteNumbers[i] = byteCharacters.charCodeAt(i);
-        }
+        writeString(0, 'RIFF');
+        view.setUint32(4, 36 + dataLength, true);
+        writeString(8, 'WAVE');
+        writeString(12, 'fmt ');
+        view.setUint32(16, 16, true);             // fmt chunk size
+        view.setUint16(20, 1, true);              // PCM
+        view.setUint16(22, channels, true);
+        view.setUint32(24, sampleRate, true);
+        view.setUint32(28, sampleRate * channels * 2, true);
+        view.setUint16(32, channels * 2, true);   // block align
+        view.setUint16(34, 16, true);             // bits per sample
+        writeString(36, 'data');
+        view.setUint32(40, dataLength, true);
         
-        const byteArray = new Uint8Array(byteNumbers);
-        return new Blob([byteArray], { type: mimeType });
+        return new Blob([header, ...chunks], { type: 'audio/wav' });
     }
     
     // Public methods
@@ -126,19 +126,12 @@ class VoiceInterface {
         if (this.audioChunks.length > 0) {
             const audioBlob = new Blob(this.audioChunks, { type: 'audio/webm' });
             
-            // Convert to base64 for transmission
-            const reader = new FileReader();
-            reader.onload = () => {
-                const base64Audio = reader.result.split(',')[1];
-                
-                // Send to server via WebSocket
-                if (window.wsClient && window.wsClient.isConnected) {
-                    window.wsClient.sendAudioData(base64Audio);
-                } else {
-                    this.handleError({ message: 'Not connected to server' });
-                }
-            };
-            reader.readAsDataURL(audioBlob);
+            // Send to server via WebSocket as a binary frame
+            if (window.wsClient && window.wsClient.isConnected) {
+                window.wsClient.sendAudioData(audioBlob);
+            } else {
+                this.handleError({ message: 'Not connected to server' });
+            }
         }
     }
     
@@ -1,3 +1,14 @@
+// First byte of binary frames from the server identifies their payload
+const BINARY_FRAME_TAGS = {
+    AUDIO_CHUNK: 0x01,
+    COMPRESSED_JSON: 0x02
+};
+
+// First byte of binary frames sent to the server
+const CLIENT_FRAME_TAGS = {
+    AUDIO_DATA: 0x01
+};
+
 class WebSocketClient {
     constructor() {
         this.websocket = null;
@@ -9,6 +20,9 @@ class WebSocketClient {
         this.messageHandlers = new Map();
         this.connectionListeners = [];
         
+        // Frames are processed in arrival order even when inflating is async
+        this.receiveQueue = Promise.resolve();
+        
         this.setupMessageHandlers();
     }
     
@@ -19,7 +33,8 @@ class WebSocketClient {
         this.messageHandlers.set('error', this.handleError.bind(this));
         this.messageHandlers.set('transcription', this.handleTranscription.bind(this));
         this.messageHandlers.set('response', this.handleResponse.bind(this));
-        this.messageHandlers.set('audio_response', this.handleAudioResponse.bind(this));
+        this.messageHandlers.set('audio_stream_start', this.handleAudioStreamStart.bind(this));
+        this.messageHandlers.set('audio_stream_end', this.handleAudioStreamEnd.bind(this));
         this.messageHandlers.set('provider_changed', this.handleProviderChanged.bind(this));
         this.messageHandlers.set('model_changed', this.handleModelChanged.bind(this));
         this.messageHandlers.set('system_status_response', this.handleSystemStatusResponse.bind(this));
@@ -38,6 +53,7 @@ class WebSocketClient {
             // Connect to WebSocket
             const wsUrl = `ws://${window.location.host}/ws/${this.sessionId}`; 
             this.websocket = new WebSocket(wsUrl);
+            this.websocket.binaryType = 'arraybuffer';
             
             this.websocket.onopen = this.onOpen.bind(this);
             this.websocket.onmessage = this.onMessage.bind(this);
@@ -78,18 +94,57 @@ class WebSocketClient {
     }
     
     onMessage(event) {
-        try {
-            const message = JSON.parse(event.data);
-            const handler = this.messageHandlers.get(message.type);
-            
-            if (handler) {
-                handler(message);
-            } else {
-                console.warn('Unknown message type:', message.type);
-            }
-            
-        } catch (error) {
-            console.error('Error processing message:', error);
+        this.receiveQueue = this.receiveQueue
+            .then(() => this.processFrame(event.data))
+            .catch(error => {
+                console.error('Error processing message:', error);
+            });
+    }
+    
+    async processFrame(data) {
+        if (data instanceof ArrayBuffer) {
+            await this.handleBinaryFrame(data);
+        } else {
+            this.dispatchPayload(JSON.parse(data));
+        }
+    }
+    
+    dispatchPayload(data) {
+        // The server may batch several messages into one frame
+        if (Array.isArray(data)) {
+            data.forEach(message => this.dispatchMessage(message));
+        } else {
+            this.dispatchMessage(data);
+        }
+    }
+    
+    async handleBinaryFrame(buffer) {
+        // The first byte tags the payload type
+        const tag = new Uint8Array(buffer, 0, 1)[0];
+        
+        if (tag === BINARY_FRAME_TAGS.AUDIO_CHUNK) {
+            this.dispatchEvent('audioStreamChunk', buffer.slice(1));
+        } else if (tag === BINARY_FRAME_TAGS.COMPRESSED_JSON) {
+            const json = await this.inflate(buffer.slice(1));
+            this.dispatchPayload(JSON.parse(json));
+        } else {
+            console.warn('Unknown binary frame tag:', tag);
+        }
+    }
+    
+    async inflate(buffer) {
+        // zlib-wrapped deflate, as produced by the server's zlib.compress
+        const stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream('deflate'));
+        return new Response(stream).text();
+    }
+    
+    dispatchMessage(message) {
+        const handler = this.messageHandlers.get(message.type);
+        
+        if (handler) {
+            handler(message);
+        } else {
+            console.warn('Unknown message type:', message.type);
         }
     }
     
@@ -140,8 +195,16 @@ class WebSocketClient {
     }
     
     send(message) {
+        return this.sendRaw(JSON.stringify(message));
+    }
+    
+    sendBinary(tag, blob) {
+        return this.sendRaw(new Blob([new Uint8Array([tag]), blob]));
+    }
+    
+    sendRaw(data) {
         if (this.isConnected && this.websocket) {
-            this.websocket.send(JSON.stringify(message));
+            this.websocket.send(data);
             return true;
         } else {
             console.warn('Cannot send message: not connected');
@@ -210,8 +273,12 @@ class WebSocketClient {
         this.dispatchEvent('response', message);
     }
     
-    handleAudioResponse(message) {
-        this.dispatchEvent('audioResponse', message);
+    handleAudioStreamStart(message) {
+        this.dispatchEvent('audioStreamStart', message);
+    }
+    
+    handleAudioStreamEnd(message) {
+        this.dispatchEvent('audioStreamEnd', message);
     }
     
     handleProviderChanged(message) {
@@ -248,12 +315,9 @@ class WebSocketClient {
     }
     
     // API Methods
-    sendAudioData(audioData) {
-        return this.send({
-            type: 'audio_data',
-            data: audioData,
-            timestamp: new Date().toISOString()
-        });
+    sendAudioData(audioBlob) {
+        // Recorded audio goes out as a raw binary frame, not base64 JSON
+        return this.sendBinary(CLIENT_FRAME_TAGS.AUDIO_DATA, audioBlob);
     }
     
     sendTextInput(text) {
@@ -14,10 +14,8 @@ sys.path.insert(0, str(project_root))
 
 async def main():
     """Main startup function"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    # Importing the config installs the queued log handlers
+    import backend.core.config  # noqa: F401
     
     logger = logging.getLogger(__name__)
     logger.info("Starting Self-Aware Voice Assistant...")
@@ -33,7 +31,14 @@ async def main():
             host="0.0.0.0",
             port=8000,
             log_level="info",
-            reload=False  # Set to True for development
+            access_log=False,  # Skip a synchronous log write per request
+            reload=False,  # Set to True for development
+            # Pin the fast C implementations shipped with uvicorn[standard]
+            loop="uvloop",
+            http="httptools",
+            ws="websockets",
+            # Large messages are compressed once in the handler instead
+            ws_per_message_deflate=False
         )
         
         server = uvicorn.Server(config)
@@ -45,5 +50,14 @@ async def main():
         logger.error(f"Error starting application: {e}")
         sys.exit(1)
 
+def install_event_loop_policy():
+    """Use uvloop's libuv-based event loop when it is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 if __name__ == "__main__":
+    install_event_loop_policy()
     asyncio.run(main())
\ No newline at end of file